@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+
+def _event_start(event: dict[str, Any]) -> datetime:
+    """Return the start of an event as an aware datetime for ordering."""
+    value = str(event.get("start", ""))
+    if "T" in value:
+        parsed = dt_util.parse_datetime(value)
+        if parsed is not None:
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+            return parsed
+    else:
+        day = dt_util.parse_date(value)
+        if day is not None:
+            return dt_util.start_of_local_day(day)
+    return datetime.max.replace(tzinfo=dt_util.UTC)
+
+
+def _event_key(event: dict[str, Any]) -> tuple[str, str, str]:
+    """Identity used to drop the same event shared between calendars."""
+    return (
+        str(event.get("summary", "")).strip().casefold(),
+        str(event.get("start", "")),
+        str(event.get("end", "")),
+    )
+
+
+def merge_events(
+    calendars: Iterable[list[dict[str, Any]]], max_events: int
+) -> list[dict[str, Any]]:
+    """Merge events from several calendars into one chronological agenda.
+
+    Only the earliest ``max_events`` of each calendar can make it into the
+    result, so each calendar is reduced with a bounded heap before a k-way
+    merge; duplicates are dropped as they stream past and the merge stops as
+    soon as the agenda is full.
+    """
+    streams = []
+    for index, events in enumerate(calendars):
+        earliest = heapq.nsmallest(max_events, events, key=_event_start)
+        streams.append(
+            ((_event_start(event), index, pos, event) for pos, event in enumerate(earliest))
+        )
+
+    def _unique() -> Iterator[dict[str, Any]]:
+        seen: set[tuple[str, str, str]] = set()
+        for _start, _index, _pos, event in heapq.merge(*streams):
+            key = _event_key(event)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield event
+
+    return list(islice(_unique(), max_events))
+
+
+def format_event(event: dict[str, Any]) -> str:
+    """Format an event as a single agenda line."""
+    summary = event.get("summary", "Untitled")
+    event_start = event.get("start", "")
+    if "T" in str(event_start):
+        # datetime event - show time
+        try:
+            dt = dt_util.parse_datetime(event_start)
+            time_str = dt.strftime("%H:%M") if dt else event_start
+        except (ValueError, AttributeError):
+            time_str = event_start
+    else:
+        time_str = "All day"
+    return f"{time_str} {summary}"
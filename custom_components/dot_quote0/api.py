@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import hashlib
+import json
 import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
 from .const import API_BASE_URL
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,12 +35,184 @@ class DotConnectionError(DotApiError):
     """Connection error."""
 
 
+class DotCircuitOpenError(DotConnectionError):
+    """Request rejected without being sent because the circuit is open."""
+
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures, then let a single probe through."""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return BREAKER_CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return BREAKER_HALF_OPEN
+        return BREAKER_OPEN
+
+    def check(self, name: str) -> None:
+        """Raise DotCircuitOpenError unless a request may be sent now."""
+        state = self.state
+        if state == BREAKER_OPEN or (state == BREAKER_HALF_OPEN and self._probing):
+            raise DotCircuitOpenError(f"Circuit open for {name}, not sending request")
+
+    def begin(self) -> None:
+        """Mark a request as sent; in half-open state it becomes the probe."""
+        if self.state == BREAKER_HALF_OPEN:
+            self._probing = True
+
+    def release(self) -> None:
+        """End a request whose outcome says nothing about this breaker."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                _LOGGER.warning("Dot. API failing, pausing requests for %ss", self.reset_timeout)
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"state": self.state, "failures": self.failures}
+
+
+@dataclass(frozen=True, slots=True)
+class JsonCodec:
+    """Encoder/decoder for request and response bodies."""
+
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+STDLIB_CODEC = JsonCodec(
+    dumps=lambda obj: json.dumps(obj, separators=(",", ":")).encode(),
+    loads=json.loads,
+)
+DEFAULT_CODEC = (
+    JsonCodec(dumps=orjson.dumps, loads=orjson.loads) if orjson else STDLIB_CODEC
+)
+
+
+# Characters of a base64 string once whitespace is removed
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+_DATA_URI_RE = re.compile(r"data:[^,]*;base64,", re.IGNORECASE)
+
+
+def base64_text(image: str) -> str:
+    """Return base64 image data without whitespace or a data: URI prefix."""
+    image = "".join(image.split())
+    if match := _DATA_URI_RE.match(image):
+        return image[match.end():]
+    return image
+
+
+def _image_body(codec: JsonCodec, fields: dict[str, Any], image: bytes | str) -> bytes:
+    """Build an image push body without routing the image through the encoder.
+
+    Raw bytes are base64-encoded straight into bytes. Base64 strings have
+    their whitespace and any data: URI prefix removed and must then consist
+    of base64 characters only, which makes them JSON-safe; both are spliced
+    into the serialized fields in a single join.
+    """
+    if isinstance(image, bytes):
+        b64 = base64.b64encode(image)
+    else:
+        image = base64_text(image)
+        if not _BASE64_RE.fullmatch(image):
+            raise DotApiError("Image is not valid base64 data")
+        b64 = image.encode("ascii")
+    head = codec.dumps(fields)
+    sep = b"," if fields else b""
+    return b"".join((head[:-1], sep, b'"image":"', b64, b'"}'))
+
+
+class RateLimiter:
+    """Space requests out so no more than a set number start per second.
+
+    Each API key has its own limiter, as the cloud limits each key's rate.
+    """
+
+    def __init__(self, rate: float = 0.0) -> None:
+        # Requests per second; 0 means unlimited
+        self.rate = rate
+        self._next_slot = 0.0
+
+    @property
+    def backlog(self) -> float:
+        """Return how many seconds a request made now would wait."""
+        if self.rate <= 0:
+            return 0.0
+        return max(0.0, self._next_slot - asyncio.get_running_loop().time())
+
+    async def acquire(self) -> None:
+        """Wait for the next free request slot."""
+        rate = self.rate
+        if rate <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1 / rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
 class DotApi:
     """Async client for the Dot. MindReset cloud API."""
 
-    def __init__(self, session: aiohttp.ClientSession, api_key: str) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        api_key: str,
+        limiter: RateLimiter | None = None,
+        codec: JsonCodec = DEFAULT_CODEC,
+        base_url: str = API_BASE_URL,
+    ) -> None:
         self._session = session
         self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._limiter = limiter
+        self._codec = codec
+        # path -> (ETag, body digest, parsed body) of the last conditional GET
+        self._conditional_cache: dict[str, tuple[str | None, bytes, Any]] = {}
+        self.key_breaker = CircuitBreaker()
+        self.device_breakers: dict[str, CircuitBreaker] = {}
+
+    @property
+    def backlog(self) -> float:
+        """Return how many seconds a request made now would wait for the limiter."""
+        return self._limiter.backlog if self._limiter is not None else 0.0
+
+    def device_breaker(self, device_id: str) -> CircuitBreaker:
+        if device_id not in self.device_breakers:
+            self.device_breakers[device_id] = CircuitBreaker()
+        return self.device_breakers[device_id]
+
+    def conditional_entries(self, device_id: str) -> list[tuple[str | None, bytes, Any]]:
+        """Return the conditional GET cache entries held for a device."""
+        marker = f"/device/{device_id}/"
+        return [
+            entry for path, entry in self._conditional_cache.items() if marker in path
+        ]
 
     @property
     def _headers(self) -> dict[str, str]:
@@ -40,44 +225,144 @@ class DotApi:
         self,
         method: str,
         path: str,
-        json: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+        device_id: str | None = None,
+        conditional: bool = False,
+        body: bytes | None = None,
+        timeout: aiohttp.ClientTimeout = REQUEST_TIMEOUT,
     ) -> Any:
-        url = f"{API_BASE_URL}{path}"
+        """Send a request and return the decoded JSON body.
+
+        payload is encoded with the client's codec; body is sent as-is for
+        callers that serialized it themselves.
+
+        With conditional, the ETag of the last response is sent as
+        If-None-Match; when the server answers 304, or returns a body
+        identical to the last one, the previously decoded object itself is
+        returned, so callers can skip rebuilding derived data with an
+        identity check.
+        """
+        # Connection failures trip the breaker for the whole key; server
+        # errors for one device only trip that device's breaker.
+        breakers = [self.key_breaker]
+        if device_id is not None:
+            breakers.append(self.device_breaker(device_id))
+        names = [
+            device_id if breaker is not self.key_breaker else "API key"
+            for breaker in breakers
+        ]
+        for breaker, name in zip(breakers, names):
+            breaker.check(name)
+        if self._limiter is not None:
+            await self._limiter.acquire()
+            # Another request may have become the half-open probe while this
+            # one waited for its slot; check again with no await before begin.
+            for breaker, name in zip(breakers, names):
+                breaker.check(name)
+        for breaker in breakers:
+            breaker.begin()
+        device_breaker = breakers[-1]
+
+        url = f"{self._base_url}{path}"
+        if payload is not None:
+            body = self._codec.dumps(payload)
+        headers = self._headers
+        cached = self._conditional_cache.get(path) if conditional else None
+        if cached is not None and cached[0] is not None:
+            headers["If-None-Match"] = cached[0]
         try:
             async with self._session.request(
-                method, url, headers=self._headers, json=json
+                method, url, headers=headers, data=body, timeout=timeout
             ) as resp:
+                if resp.status >= 500:
+                    for breaker in breakers:
+                        if breaker is device_breaker:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                    raise DotApiError(f"Server error: {resp.status}")
+                for breaker in breakers:
+                    breaker.record_success()
                 if resp.status == 401:
                     raise DotAuthError("Invalid or expired API key")
                 if resp.status == 403:
                     raise DotApiError("Forbidden: no permission for this device")
                 if resp.status == 404:
                     raise DotApiError("Device or resource not found")
-                if resp.status >= 500:
-                    raise DotApiError(f"Server error: {resp.status}")
                 resp.raise_for_status()
-                return await resp.json()
-        except aiohttp.ClientError as err:
+                if conditional and resp.status == 304 and cached is not None:
+                    return cached[2]
+                raw = await resp.read()
+                if conditional:
+                    digest = hashlib.blake2b(raw, digest_size=16).digest()
+                    if cached is not None and cached[1] == digest:
+                        return cached[2]
+                result = self._decode(raw)
+                if conditional:
+                    self._conditional_cache[path] = (
+                        resp.headers.get("ETag"), digest, result
+                    )
+                return result
+        except aiohttp.ClientResponseError as err:
             raise DotConnectionError(f"Connection error: {err}") from err
+        except asyncio.CancelledError:
+            for breaker in breakers:
+                breaker.release()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.key_breaker.record_failure()
+            if device_breaker is not self.key_breaker:
+                device_breaker.release()
+            raise DotConnectionError(f"Connection error: {err}") from err
+
+    def _decode(self, raw: bytes) -> Any:
+        if not raw.strip():
+            return None
+        try:
+            return self._codec.loads(raw)
+        except ValueError as err:
+            raise DotApiError(f"Invalid JSON response: {err}") from err
 
     async def get_devices(self) -> list[dict[str, Any]]:
         return await self._request("GET", "/api/authV2/open/devices")
 
     async def get_device_status(self, device_id: str) -> dict[str, Any]:
         return await self._request(
-            "GET", f"/api/authV2/open/device/{device_id}/status"
+            "GET", f"/api/authV2/open/device/{device_id}/status",
+            device_id=device_id,
+            conditional=True,
+        )
+
+    async def watch_device_status(
+        self, device_id: str, wait: float
+    ) -> dict[str, Any]:
+        """Long-poll a device's status.
+
+        The first call answers at once. Later calls are held by the cloud
+        until the status differs from the last one returned, or wait seconds
+        pass; in that case the last status object itself is returned again.
+        Raises DotApiError if the cloud does not offer the endpoint.
+        """
+        return await self._request(
+            "GET", f"/api/authV2/open/device/{device_id}/status/watch?wait={int(wait)}",
+            device_id=device_id,
+            conditional=True,
+            timeout=aiohttp.ClientTimeout(total=wait + REQUEST_TIMEOUT.total),
         )
 
     async def switch_next_content(self, device_id: str) -> dict[str, Any]:
         return await self._request(
-            "POST", f"/api/authV2/open/device/{device_id}/next"
+            "POST", f"/api/authV2/open/device/{device_id}/next",
+            device_id=device_id,
         )
 
     async def list_device_tasks(
         self, device_id: str, task_type: str = "loop"
     ) -> list[dict[str, Any]]:
         return await self._request(
-            "GET", f"/api/authV2/open/device/{device_id}/{task_type}/list"
+            "GET", f"/api/authV2/open/device/{device_id}/{task_type}/list",
+            device_id=device_id,
+            conditional=True,
         )
 
     async def send_text(
@@ -90,19 +375,24 @@ class DotApi:
             if key in kwargs and kwargs[key] is not None:
                 payload[key] = kwargs[key]
         return await self._request(
-            "POST", f"/api/authV2/open/device/{device_id}/text", json=payload
+            "POST", f"/api/authV2/open/device/{device_id}/text",
+            payload=payload,
+            device_id=device_id,
         )
 
     async def send_image(
         self, device_id: str, **kwargs: Any
     ) -> dict[str, Any]:
-        payload: dict[str, Any] = {}
+        """Push an image; image may be raw bytes or a base64 string."""
+        fields: dict[str, Any] = {}
         for key in (
-            "refreshNow", "image", "link", "border",
+            "refreshNow", "link", "border",
             "ditherType", "ditherKernel", "taskKey",
         ):
             if key in kwargs and kwargs[key] is not None:
-                payload[key] = kwargs[key]
+                fields[key] = kwargs[key]
         return await self._request(
-            "POST", f"/api/authV2/open/device/{device_id}/image", json=payload
+            "POST", f"/api/authV2/open/device/{device_id}/image",
+            body=_image_body(self._codec, fields, kwargs["image"]),
+            device_id=device_id,
         )
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+from datetime import timedelta
+from typing import Any
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .api import BREAKER_CLOSED
 from .const import DOMAIN, MANUFACTURER
 from .coordinator import DotDataCoordinator
+from .throttle import WriteThrottle
+
+# How often the Online sensor's freshness attributes are rewritten while
+# nothing else about the device's connectivity changes
+ONLINE_REFRESH_INTERVAL = timedelta(minutes=15)
 
 
 async def async_setup_entry(
@@ -20,10 +30,11 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: DotDataCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = [
-        DotOnlineBinarySensor(coordinator, device_id)
-        for device_id in coordinator.data
-    ]
+    entities: list[BinarySensorEntity] = []
+    for device_id in coordinator.data:
+        device_coordinator = coordinator.for_device(device_id)
+        entities.append(DotOnlineBinarySensor(device_coordinator, device_id))
+        entities.append(DotCircuitBinarySensor(device_coordinator, device_id))
     async_add_entities(entities)
 
 
@@ -33,6 +44,8 @@ class DotOnlineBinarySensor(CoordinatorEntity[DotDataCoordinator], BinarySensorE
     _attr_has_entity_name = True
     _attr_name = "Online"
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    # Change on every poll; they are only useful for the current state
+    _unrecorded_attributes = frozenset({"last_updated", "age_seconds"})
 
     def __init__(
         self, coordinator: DotDataCoordinator, device_id: str
@@ -40,6 +53,7 @@ class DotOnlineBinarySensor(CoordinatorEntity[DotDataCoordinator], BinarySensorE
         super().__init__(coordinator)
         self._device_id = device_id
         self._attr_unique_id = f"{device_id}_online"
+        self._throttle = WriteThrottle(max_interval=ONLINE_REFRESH_INTERVAL)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -61,3 +75,75 @@ class DotOnlineBinarySensor(CoordinatorEntity[DotDataCoordinator], BinarySensorE
         if data is None:
             return None
         return data.online
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        data = self.coordinator.data.get(self._device_id)
+        if data is None:
+            return {}
+        return {
+            "last_updated": data.last_updated.isoformat(),
+            "stale": data.stale,
+            "age_seconds": round(data.age),
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = self.coordinator.data.get(self._device_id)
+        # Online and stale changes are written at once; the freshness
+        # attributes alone only every ONLINE_REFRESH_INTERVAL.
+        if self._throttle.should_write(
+            (self.available, self.is_on, data.stale if data else None)
+        ):
+            super()._handle_coordinator_update()
+
+
+class DotCircuitBinarySensor(CoordinatorEntity[DotDataCoordinator], BinarySensorEntity):
+    """Binary sensor that is on while requests for a Dot. device fail fast."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Cloud Circuit Open"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, coordinator: DotDataCoordinator, device_id: str
+    ) -> None:
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._attr_unique_id = f"{device_id}_circuit_open"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        data = self.coordinator.data.get(self._device_id)
+        model_name = "Quote/0"
+        if data:
+            model_name = f"Quote/0 (Edition {data.edition})"
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device_id)},
+            name=data.display_name if data else f"Quote/0 {self._device_id[-4:]}",
+            manufacturer=MANUFACTURER,
+            model=model_name,
+            sw_version=data.firmware_version if data else None,
+        )
+
+    @property
+    def available(self) -> bool:
+        # Must stay available while the coordinator is failing
+        return True
+
+    @property
+    def is_on(self) -> bool:
+        api = self.coordinator.api_for(self._device_id)
+        return (
+            api.key_breaker.state != BREAKER_CLOSED
+            or api.device_breaker(self._device_id).state != BREAKER_CLOSED
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        api = self.coordinator.api_for(self._device_id)
+        return {
+            "api_key_circuit": api.key_breaker.state,
+            "device_circuit": api.device_breaker(self._device_id).state,
+        }
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-import base64
 import logging
-from pathlib import Path
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
@@ -11,8 +9,9 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER
+from .const import DATA_RESOLVER, DOMAIN, MANUFACTURER
 from .coordinator import DotDataCoordinator
+from .resolver import ImageResolver
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,16 +24,6 @@ def _get_entity_state(hass: HomeAssistant, entity_id: str) -> str | None:
     return state.state
 
 
-def _resolve_image(image_value: str) -> str:
-    """Return base64 image data. If value looks like a file path, read and encode it."""
-    if image_value.startswith("/") or image_value.startswith("./"):
-        path = Path(image_value)
-        if path.is_file():
-            return base64.b64encode(path.read_bytes()).decode("utf-8")
-        raise ValueError(f"Image file not found: {image_value}")
-    return image_value
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -44,9 +33,10 @@ async def async_setup_entry(
     entities: list[ButtonEntity] = []
 
     for device_id in coordinator.data:
-        entities.append(DotNextContentButton(coordinator, device_id))
-        entities.append(DotSendTextButton(coordinator, device_id))
-        entities.append(DotSendImageButton(coordinator, device_id))
+        device_coordinator = coordinator.for_device(device_id)
+        entities.append(DotNextContentButton(device_coordinator, device_id))
+        entities.append(DotSendTextButton(device_coordinator, device_id))
+        entities.append(DotSendImageButton(device_coordinator, device_id))
 
     async_add_entities(entities)
 
@@ -89,7 +79,9 @@ class DotNextContentButton(CoordinatorEntity[DotDataCoordinator], ButtonEntity):
         return data is not None and data.online
 
     async def async_press(self) -> None:
-        await self.coordinator.api.switch_next_content(self._device_id)
+        await self.coordinator.api_for(self._device_id).switch_next_content(
+            self._device_id
+        )
         await self.coordinator.async_request_refresh()
 
 
@@ -128,9 +120,10 @@ class DotSendTextButton(CoordinatorEntity[DotDataCoordinator], ButtonEntity):
             _LOGGER.warning("Send Text: both title and message are empty, skipping")
             return
 
-        await self.coordinator.api.send_text(
+        await self.coordinator.delivery.async_send(
             did,
-            refreshNow=True,
+            "text",
+            True,
             title=title,
             message=message,
             signature=signature,
@@ -139,7 +132,7 @@ class DotSendTextButton(CoordinatorEntity[DotDataCoordinator], ButtonEntity):
 
 
 class DotSendImageButton(CoordinatorEntity[DotDataCoordinator], ButtonEntity):
-    """Button that sends image content from the image data entity to the device."""
+    """Button that sends the staged image, or the image source entity, to the device."""
 
     _attr_has_entity_name = True
     _attr_name = "Send Image"
@@ -163,23 +156,30 @@ class DotSendImageButton(CoordinatorEntity[DotDataCoordinator], ButtonEntity):
 
     async def async_press(self) -> None:
         did = self._device_id
-        image_raw = _get_entity_state(self.hass, f"text.{DOMAIN}_{did}_image_data")
-
-        if not image_raw:
-            _LOGGER.warning("Send Image: image data is empty, skipping")
-            return
-
-        image_data = await self.hass.async_add_executor_job(
-            _resolve_image, image_raw
-        )
+        staged = self.coordinator.staged_images.get(did)
+        image_data: bytes | str
+        if staged is not None:
+            image_data = staged.data
+        else:
+            source = _get_entity_state(
+                self.hass, f"text.{DOMAIN}_{did}_image_source"
+            )
+            if not source:
+                _LOGGER.warning(
+                    "Send Image: no staged image and image source is empty, skipping"
+                )
+                return
+            resolver: ImageResolver = self.hass.data[DOMAIN][DATA_RESOLVER]
+            image_data = await resolver.async_resolve(source)
 
         dither_type = _get_entity_state(
             self.hass, f"select.{DOMAIN}_{did}_dither_type"
         )
 
-        await self.coordinator.api.send_image(
+        await self.coordinator.delivery.async_send(
             did,
-            refreshNow=True,
+            "image",
+            True,
             image=image_data,
             ditherType=dither_type,
         )
@@ -6,11 +6,29 @@ from typing import Any
 import aiohttp
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import DotApi, DotAuthError, DotConnectionError
-from .const import CONF_API_KEY, DOMAIN
+from .const import (
+    CONF_API_KEY,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_PER_DEVICE_POLLING,
+    CONF_QUIET_END,
+    CONF_QUIET_START,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_PER_DEVICE_POLLING,
+    DEFAULT_QUIET_END,
+    DEFAULT_QUIET_START,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +44,11 @@ class DotQuote0ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return DotQuote0OptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -64,3 +87,51 @@ class DotQuote0ConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
         )
+
+
+class DotQuote0OptionsFlow(OptionsFlow):
+    """Options flow for Dot. Quote/0."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_QUIET_START,
+                        default=options.get(CONF_QUIET_START, DEFAULT_QUIET_START),
+                    ): selector.TimeSelector(),
+                    vol.Optional(
+                        CONF_QUIET_END,
+                        default=options.get(CONF_QUIET_END, DEFAULT_QUIET_END),
+                    ): selector.TimeSelector(),
+                    vol.Optional(
+                        CONF_PER_DEVICE_POLLING,
+                        default=options.get(
+                            CONF_PER_DEVICE_POLLING, DEFAULT_PER_DEVICE_POLLING
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_MAX_REQUESTS_PER_SECOND,
+                        default=options.get(
+                            CONF_MAX_REQUESTS_PER_SECOND,
+                            DEFAULT_MAX_REQUESTS_PER_SECOND,
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0, max=10, step=0.5,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                }
+            ),
+        )
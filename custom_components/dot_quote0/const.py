@@ -2,6 +2,34 @@ DOMAIN = "dot_quote0"
 API_BASE_URL = "https://dot.mindreset.tech"
 MANUFACTURER = "MindReset"
 
+# Keys in hass.data[DOMAIN] shared by all config entries
+DATA_FLEET = "fleet"
+DATA_RESOLVER = "resolver"
+DATA_SCENES = "scenes"
+DATA_STARTUP = "startup"
+DATA_SYSTEM_STATUS = "system_status"
+
 DEFAULT_SCAN_INTERVAL = 300  # 5 minutes
+DEFAULT_MAX_REQUESTS_PER_SECOND = 10  # cloud rate limit
 
 CONF_API_KEY = "api_key"
+CONF_PER_DEVICE_POLLING = "per_device_polling"
+DEFAULT_PER_DEVICE_POLLING = True  # spreads polls over the interval
+CONF_MAX_REQUESTS_PER_SECOND = "max_requests_per_second"
+
+CONF_QUIET_START = "quiet_start"
+CONF_QUIET_END = "quiet_end"
+DEFAULT_QUIET_START = "22:00:00"
+DEFAULT_QUIET_END = "07:00:00"
+
+DELIVERY_IMMEDIATE = "immediate"
+DELIVERY_BATCHED = "batched"
+DELIVERY_QUIET_HOURS = "quiet_hours"
+DELIVERY_POLICIES = [DELIVERY_IMMEDIATE, DELIVERY_BATCHED, DELIVERY_QUIET_HOURS]
+
+DITHER_TYPES = ["DIFFUSION", "ORDERED", "NONE"]
+DITHER_KERNELS = [
+    "FLOYD_STEINBERG", "ATKINSON", "BURKES", "SIERRA2", "STUCKI",
+    "JARVIS_JUDICE_NINKE", "DIFFUSION_ROW", "DIFFUSION_COLUMN",
+    "DIFFUSION_2D", "THRESHOLD",
+]
@@ -1,18 +1,39 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import DotApi, DotApiError, DotConnectionError
+from .api import BREAKER_CLOSED, DotApi, DotApiError, DotConnectionError
 from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .delivery import DotDeliveryQueue
+from .history import PushHistory
+from .playlist import DotPlaylists
+from .scheduler import device_jitter, entry_phase, poll_offsets
+from .stream import DotStatusStream
+
+if TYPE_CHECKING:
+    from .fleet import DotFleet
+    from .imaging import Bitmap, StagedImage
 
 _LOGGER = logging.getLogger(__name__)
 
+# Delay of the first poll of a device after a push, while its render is
+# expected; it doubles with every poll that sees no render, until regular
+# polling would come sooner.
+FAST_POLL_INTERVAL = timedelta(seconds=15)
+
+# Safety-net polling interval while the status stream delivers changes
+STREAM_POLL_INTERVAL = timedelta(minutes=30)
+
 
 class DotDeviceData:
     """Parsed device status data."""
@@ -23,6 +44,10 @@ class DotDeviceData:
         self.model: str = device_info.get("model", "quote_0")
         self.edition: int = device_info.get("edition", 1)
 
+        # Decoded status body; DotApi returns this same object while the
+        # cloud reports no change, letting the coordinator reuse this instance.
+        self.raw_status = status
+
         self.alias: str | None = status.get("alias")
         self.location: str | None = status.get("location")
         self.tasks: list[dict[str, Any]] = []
@@ -48,6 +73,16 @@ class DotDeviceData:
 
         self.online: bool = True
 
+        # When this data was fetched; stale once a later poll failed to reach
+        # the cloud and this last-good copy was kept instead.
+        self.last_updated: datetime = dt_util.utcnow()
+        self.stale: bool = False
+
+    @property
+    def age(self) -> float:
+        """Seconds since this data was fetched."""
+        return (dt_util.utcnow() - self.last_updated).total_seconds()
+
     @property
     def display_name(self) -> str:
         if self.alias:
@@ -62,6 +97,32 @@ class DotDeviceData:
         except (ValueError, AttributeError):
             return None
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of this device's status."""
+        return {
+            "name": self.display_name,
+            "alias": self.alias,
+            "location": self.location,
+            "series": self.series,
+            "model": self.model,
+            "edition": self.edition,
+            "firmware_version": self.firmware_version,
+            "power_state": self.power_state,
+            "power_description": self.power_description,
+            "battery_status": self.battery_status,
+            "wifi_signal": self.wifi_signal,
+            "online": self.online,
+            "last_updated": self.last_updated.isoformat(),
+            "age_seconds": round(self.age, 1),
+            "stale": self.stale,
+            "last_render": self.last_render,
+            "next_render_battery": self.next_render_battery,
+            "next_render_power": self.next_render_power,
+            "screen_rotated": self.screen_rotated,
+            "screen_border": self.screen_border,
+            "tasks": self.tasks,
+        }
+
 
 class DotDataCoordinator(DataUpdateCoordinator[dict[str, DotDeviceData]]):
     """Coordinator that polls status for all Dot. devices."""
@@ -73,25 +134,248 @@ class DotDataCoordinator(DataUpdateCoordinator[dict[str, DotDeviceData]]):
         hass: HomeAssistant,
         api: DotApi,
         devices: list[dict[str, Any]],
+        parent: DotDataCoordinator | None = None,
     ) -> None:
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
+            name=DOMAIN if parent is None else f"{DOMAIN}_{devices[0]['id']}",
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
         self.api = api
         self._devices = devices
+        # Phase durations of the entry's setup, shown in diagnostics
+        self.startup_timings: dict[str, float] = {}
+        # Set when each device is polled by its own DotDeviceCoordinator
+        self.device_coordinators: dict[str, DotDeviceCoordinator] = {}
+        if parent is not None:
+            # A per-device coordinator works on its entry's shared state
+            self.fleet = parent.fleet
+            self.frames = parent.frames
+            self.staged_images = parent.staged_images
+            self.delivery = parent.delivery
+            self.history = parent.history
+            self.playlists = parent.playlists
+            self.stream = parent.stream
+        else:
+            # Set when several entries share devices; picks the key per device
+            self.fleet: DotFleet | None = None
+            # Last 1-bit frame pushed per (device_id, taskKey), for change detection
+            self.frames: dict[tuple[str, str | None], Bitmap] = {}
+            # Images staged via the stage_image service; kept out of entity state
+            self.staged_images: dict[str, StagedImage] = {}
+            self.delivery = DotDeliveryQueue(hass, self)
+            self.history = PushHistory()
+            self.playlists = DotPlaylists(hass, self)
+            self.stream = DotStatusStream(hass, self)
+        # True while the status stream delivers this coordinator's changes
+        self.stream_active = False
+        # Pending fast polls of devices expecting a render, by device id
+        self._render_watches: dict[str, CALLBACK_TYPE] = {}
+
+    def api_for(self, device_id: str) -> DotApi:
+        """Return the client whose key should carry requests for device_id."""
+        if self.fleet is None:
+            return self.api
+        return self.fleet.api_for(device_id, self.api)
+
+    def for_device(self, device_id: str) -> DotDataCoordinator:
+        """Return the coordinator that entities of device_id should follow."""
+        return self.device_coordinators.get(device_id, self)
+
+    @callback
+    def async_schedule_polling(
+        self, entry_id: str, per_device: bool
+    ) -> list[CALLBACK_TYPE]:
+        """Stagger regular polling after the first refresh.
+
+        The entry's polls start at a phase derived from its id, so entries
+        restarted together do not align. With per_device, polling is handed
+        to one coordinator per device: a refresh requested for one device
+        only polls that device, and the devices are spread evenly over the
+        scan interval with a deterministic jitter. Returns callbacks
+        cancelling the pending first polls.
+        """
+        interval = self.update_interval or timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        seconds = interval.total_seconds()
+        self.update_interval = None
+        if not per_device:
+            return [
+                async_call_later(
+                    self.hass, entry_phase(entry_id, seconds),
+                    self._async_start_polling(interval),
+                )
+            ]
+
+        offsets = poll_offsets(entry_id, [dev["id"] for dev in self._devices], seconds)
+        unsubs: list[CALLBACK_TYPE] = []
+        for dev in self._devices:
+            child = DotDeviceCoordinator(self.hass, self, dev)
+            self.device_coordinators[child.device_id] = child
+            unsubs.append(
+                async_call_later(
+                    self.hass, offsets[child.device_id],
+                    child._async_start_polling(interval),
+                )
+            )
+        return unsubs
+
+    def _async_start_polling(self, interval: timedelta):
+        async def _start(_now: datetime) -> None:
+            self.update_interval = interval
+            await self.async_refresh()
+
+        return _start
+
+    @callback
+    def async_expect_render(self, device_id: str) -> None:
+        """Poll a device fast after a push to it, until its render shows up.
+
+        Only that device is polled: first after FAST_POLL_INTERVAL, then
+        with the delay doubling while no new render is seen, until regular
+        polling would come sooner. Each delay is shifted by the device's
+        jitter, so devices pushed to together are not polled together.
+        """
+        coordinator = self.for_device(device_id)
+        if coordinator.stream_active or coordinator.update_interval is None:
+            return
+        device_data = (self.data or {}).get(device_id)
+        self._async_watch_render(
+            device_id,
+            device_data.last_render if device_data else None,
+            FAST_POLL_INTERVAL,
+        )
+
+    @callback
+    def _async_watch_render(
+        self, device_id: str, last_render: str | None, delay: timedelta
+    ) -> None:
+        if unsub := self._render_watches.pop(device_id, None):
+            unsub()
+
+        async def _poll(_now: datetime) -> None:
+            self._render_watches.pop(device_id, None)
+            await self.async_refresh_devices([device_id])
+            device_data = (self.data or {}).get(device_id)
+            if device_data is not None and device_data.last_render != last_render:
+                return
+            interval = self.for_device(device_id).update_interval
+            if interval is not None and delay * 2 < interval:
+                self._async_watch_render(device_id, last_render, delay * 2)
+
+        self._render_watches[device_id] = async_call_later(
+            self.hass, delay * (1 + device_jitter(device_id)), _poll
+        )
+
+    @callback
+    def async_stop_render_watches(self) -> None:
+        for unsub in self._render_watches.values():
+            unsub()
+        self._render_watches.clear()
+
+    @callback
+    def async_set_streaming(self, active: bool) -> None:
+        """Relax polling while the status stream is up; restore it when lost."""
+        self.stream_active = active
+        if self.update_interval is None:
+            # Polling has not started yet; its first update applies this
+            return
+        self.update_interval = (
+            STREAM_POLL_INTERVAL if active else timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        )
+        self._schedule_refresh()
+
+    @callback
+    def async_set_device_status(self, device_id: str, status: dict[str, Any]) -> None:
+        """Apply a status delivered by the status stream."""
+        coordinator = self.for_device(device_id)
+        previous = (coordinator.data or {}).get(device_id)
+        if previous is not None and previous.raw_status is status:
+            previous.last_updated = dt_util.utcnow()
+            previous.stale = False
+            return
+        dev = next(dev for dev in self._devices if dev["id"] == device_id)
+        device_data = DotDeviceData(dev, status)
+        device_data.tasks = previous.tasks if previous else []
+        if (
+            previous is not None
+            and device_data.last_render
+            and device_data.last_render != previous.last_render
+        ):
+            self.history.note_render(device_id, device_data.last_render)
+        if coordinator is not self:
+            self.data[device_id] = device_data
+        coordinator.async_set_updated_data(
+            {**(coordinator.data or {}), device_id: device_data}
+        )
+
+    async def async_refresh_devices(self, device_ids: Iterable[str]) -> None:
+        """Poll only the given devices, leaving the others' data untouched.
+
+        Unlike async_refresh or async_set_updated_data, this leaves every
+        coordinator's regular poll on its staggered schedule.
+        """
+        wanted = set(device_ids)
+        groups: dict[DotDataCoordinator, list[dict[str, Any]]] = {}
+        for dev in self._devices:
+            if dev["id"] in wanted:
+                groups.setdefault(self.for_device(dev["id"]), []).append(dev)
+
+        async def _refresh(
+            coordinator: DotDataCoordinator, devices: list[dict[str, Any]]
+        ) -> None:
+            fetched, _unreachable = await coordinator._async_fetch_devices(devices)
+            if coordinator is not self:
+                self.data.update(fetched)
+            coordinator.data = {**(coordinator.data or {}), **fetched}
+            coordinator.async_update_listeners()
+
+        await asyncio.gather(
+            *(_refresh(coordinator, devices) for coordinator, devices in groups.items())
+        )
 
     async def _async_update_data(self) -> dict[str, DotDeviceData]:
+        self._adapt_interval()
+        data, unreachable = await self._async_fetch_devices(self._devices)
+        if self._devices and len(unreachable) == len(self._devices):
+            raise UpdateFailed(
+                f"Could not reach the Dot. cloud for any device: {', '.join(unreachable)}"
+            )
+        if unreachable:
+            _LOGGER.warning(
+                "Keeping last known data for unreachable devices: %s",
+                ", ".join(unreachable),
+            )
+        return data
+
+    async def _async_fetch_devices(
+        self, devices: list[dict[str, Any]]
+    ) -> tuple[dict[str, DotDeviceData], list[str]]:
+        """Fetch status and tasks of devices; return data and unreachable ids."""
+        previous = self.data or {}
         data: dict[str, DotDeviceData] = {}
-        for dev in self._devices:
+        unreachable: list[str] = []
+        for dev in devices:
             device_id = dev["id"]
+            last_good = previous.get(device_id)
             try:
-                status = await self.api.get_device_status(device_id)
-                data[device_id] = DotDeviceData(dev, status)
+                status = await self.api_for(device_id).get_device_status(device_id)
+                if last_good is not None and last_good.raw_status is status:
+                    last_good.last_updated = dt_util.utcnow()
+                    last_good.stale = False
+                    data[device_id] = last_good
+                else:
+                    data[device_id] = DotDeviceData(dev, status)
             except DotConnectionError as err:
-                raise UpdateFailed(f"Connection error for {device_id}: {err}") from err
+                # Keep this device's last-good data; other devices are unaffected
+                _LOGGER.debug("Connection error for %s: %s", device_id, err)
+                unreachable.append(device_id)
+                if last_good is None:
+                    last_good = DotDeviceData(dev, {})
+                    last_good.online = False
+                last_good.stale = True
+                data[device_id] = last_good
+                continue
             except DotApiError as err:
                 _LOGGER.warning("Failed to get status for %s: %s", device_id, err)
                 dd = DotDeviceData(dev, {})
@@ -99,9 +383,60 @@ class DotDataCoordinator(DataUpdateCoordinator[dict[str, DotDeviceData]]):
                 data[device_id] = dd
             # Fetch content task list
             try:
-                tasks = await self.api.list_device_tasks(device_id)
+                tasks = await self.api_for(device_id).list_device_tasks(device_id)
                 data[device_id].tasks = tasks if isinstance(tasks, list) else []
             except (DotApiError, DotConnectionError):
                 _LOGGER.debug("Could not fetch tasks for %s", device_id)
-                data[device_id].tasks = []
+                data[device_id].tasks = last_good.tasks if last_good else []
+        for device_id, device_data in data.items():
+            last_good = previous.get(device_id)
+            if (
+                last_good is not None
+                and device_data.last_render
+                and device_data.last_render != last_good.last_render
+            ):
+                self.history.note_render(device_id, device_data.last_render)
+        return data, unreachable
+
+    def _adapt_interval(self) -> None:
+        """Keep regular polling relaxed while the status stream is up."""
+        if self.update_interval is not None and self.stream_active:
+            self.update_interval = STREAM_POLL_INTERVAL
+
+
+class DotDeviceCoordinator(DotDataCoordinator):
+    """Coordinator that polls a single device on behalf of its entry.
+
+    Shares the API client, delivery queue and image stores of the entry's
+    coordinator and mirrors its data back into it, so services looking up
+    devices through the entry coordinator keep working.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        parent: DotDataCoordinator,
+        device: dict[str, Any],
+    ) -> None:
+        super().__init__(hass, parent.api, [device], parent)
+        self.parent = parent
+        self.device_id: str = device["id"]
+        # Polling starts once this device's staggered slot comes up
+        self.update_interval = None
+        self.data = {self.device_id: parent.data[self.device_id]}
+
+    async def _async_update_data(self) -> dict[str, DotDeviceData]:
+        self._adapt_interval()
+        data, unreachable = await self._async_fetch_devices(self._devices)
+        if unreachable:
+            # One unreachable device keeps its last-good data and goes stale;
+            # only an outage of the whole API key fails the update.
+            if self.api_for(self.device_id).key_breaker.state != BREAKER_CLOSED:
+                raise UpdateFailed(
+                    f"Could not reach the Dot. cloud for {self.device_id}"
+                )
+            _LOGGER.warning(
+                "Keeping last known data for unreachable device %s", self.device_id
+            )
+        self.parent.data.update(data)
         return data
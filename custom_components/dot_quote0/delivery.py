@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, time, timedelta
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .api import DotApiError
+from .const import (
+    DEFAULT_QUIET_END,
+    DEFAULT_QUIET_START,
+    DELIVERY_BATCHED,
+    DELIVERY_IMMEDIATE,
+    DELIVERY_QUIET_HOURS,
+)
+from .history import (
+    OUTCOME_FAILED,
+    OUTCOME_QUEUED,
+    OUTCOME_SENT,
+    PushRecord,
+    parse_render_time,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import DotDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Batched content is uploaded this long before the panel's scheduled render
+FLUSH_LEAD = timedelta(seconds=60)
+
+
+class DotDeliveryQueue:
+    """Apply each device's delivery policy to outgoing pushes.
+
+    Immediate pushes go straight to the API. Batched and quiet-hours pushes
+    are held per (kind, taskKey), so repeated updates to the same task only
+    keep the latest content, and flushed together at a single point in time.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: DotDataCoordinator) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self.policies: dict[str, str] = {}
+        self.quiet_start: time = dt_util.parse_time(DEFAULT_QUIET_START)
+        self.quiet_end: time = dt_util.parse_time(DEFAULT_QUIET_END)
+        self._pending: dict[str, dict[tuple[str, str | None], dict[str, Any]]] = {}
+        self._unsub_flush: dict[str, CALLBACK_TYPE] = {}
+        # Last payload delivered per (kind, taskKey), for scene snapshots;
+        # images are only fitted to the panel when a snapshot stores them
+        self._last_sent: dict[str, dict[tuple[str, str | None], dict[str, Any]]] = {}
+
+    def pending_count(self, device_id: str) -> int:
+        return len(self._pending.get(device_id, {}))
+
+    def pending(self, device_id: str) -> list[dict[str, Any]]:
+        """Return the payloads held for a device, oldest task first."""
+        return list(self._pending.get(device_id, {}).values())
+
+    def last_sent(
+        self, device_id: str
+    ) -> list[tuple[tuple[str, str | None], dict[str, Any]]]:
+        """Return the last payload delivered per task, in delivery order."""
+        return list(self._last_sent.get(device_id, {}).items())
+
+    async def async_send(
+        self, device_id: str, kind: str, refresh_now: bool, **payload: Any
+    ) -> bool:
+        """Send or queue a push. Return True if it was sent right away."""
+        policy = self.policies.get(device_id, DELIVERY_IMMEDIATE)
+        flush_at = self._flush_time(device_id, policy)
+        if flush_at is None:
+            await self._async_push(device_id, kind, refresh_now, payload)
+            return True
+
+        self._coordinator.history.add(
+            device_id,
+            PushRecord(kind, payload.get("taskKey"), dt_util.now(), OUTCOME_QUEUED),
+        )
+        pending = self._pending.setdefault(device_id, {})
+        # Re-insert so the latest update for a task is flushed last
+        pending.pop((kind, payload.get("taskKey")), None)
+        pending[(kind, payload.get("taskKey"))] = payload
+        if device_id not in self._unsub_flush:
+            self._unsub_flush[device_id] = async_track_point_in_time(
+                self._hass, self._make_flush_callback(device_id), flush_at
+            )
+        _LOGGER.debug(
+            "Queued %s push for %s until %s (%d pending)",
+            kind, device_id, flush_at, len(pending),
+        )
+        return False
+
+    async def async_flush(self, device_id: str) -> None:
+        """Push everything queued for a device, costing one screen refresh."""
+        if unsub := self._unsub_flush.pop(device_id, None):
+            unsub()
+        pending = self._pending.pop(device_id, {})
+        if not pending:
+            return
+        # Batched content is picked up by the scheduled render; after quiet
+        # hours only the last push triggers the refresh.
+        refresh_last = self.policies.get(device_id) != DELIVERY_BATCHED
+        items = list(pending.items())
+        for index, ((kind, _task_key), payload) in enumerate(items):
+            refresh_now = refresh_last and index == len(items) - 1
+            try:
+                await self._async_push(device_id, kind, refresh_now, payload)
+            except DotApiError as err:
+                _LOGGER.warning(
+                    "Failed to deliver queued %s push to %s: %s", kind, device_id, err
+                )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel scheduled flushes; queued content is dropped."""
+        for unsub in self._unsub_flush.values():
+            unsub()
+        self._unsub_flush.clear()
+        self._pending.clear()
+
+    def _make_flush_callback(self, device_id: str):
+        async def _flush(_now: datetime) -> None:
+            self._unsub_flush.pop(device_id, None)
+            await self.async_flush(device_id)
+
+        return _flush
+
+    async def _async_push(
+        self, device_id: str, kind: str, refresh_now: bool, payload: dict[str, Any]
+    ) -> None:
+        api = self._coordinator.api_for(device_id)
+        self._coordinator.playlists.async_invalidate(device_id, payload.get("taskKey"))
+        record = PushRecord(
+            kind, payload.get("taskKey"), dt_util.now(), OUTCOME_SENT, refresh_now
+        )
+        started = monotonic()
+        try:
+            if kind == "image":
+                await api.send_image(device_id, refreshNow=refresh_now, **payload)
+            else:
+                await api.send_text(device_id, refreshNow=refresh_now, **payload)
+        except DotApiError as err:
+            record.outcome = OUTCOME_FAILED
+            record.error = str(err)
+            raise
+        finally:
+            record.latency = round(monotonic() - started, 3)
+            self._coordinator.history.add(device_id, record)
+        key = (kind, payload.get("taskKey"))
+        last_sent = self._last_sent.setdefault(device_id, {})
+        last_sent.pop(key, None)
+        last_sent[key] = payload
+        if refresh_now:
+            self._coordinator.async_expect_render(device_id)
+
+    def _flush_time(self, device_id: str, policy: str) -> datetime | None:
+        """Return when queued content should be flushed, or None to send now."""
+        now = dt_util.now()
+        if policy == DELIVERY_BATCHED:
+            data = (self._coordinator.data or {}).get(device_id)
+            if data is None:
+                return None
+            next_render = parse_render_time(
+                data.next_render_battery
+            ) or parse_render_time(data.next_render_power)
+            if next_render is None or next_render <= now:
+                return None
+            return max(now, next_render - FLUSH_LEAD)
+        if policy == DELIVERY_QUIET_HOURS:
+            return self._quiet_hours_end(now)
+        return None
+
+    def _quiet_hours_end(self, now: datetime) -> datetime | None:
+        """Return the end of the current quiet-hours window, if inside one."""
+        start, end, current = self.quiet_start, self.quiet_end, now.time()
+        if start <= end:
+            inside = start <= current < end
+        else:
+            inside = current >= start or current < end
+        if not inside:
+            return None
+        end_at = now.replace(
+            hour=end.hour, minute=end.minute, second=end.second, microsecond=0
+        )
+        if end_at <= now:
+            end_at += timedelta(days=1)
+        return end_at
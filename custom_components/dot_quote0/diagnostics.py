@@ -5,8 +5,9 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DATA_STARTUP, DOMAIN
 from .coordinator import DotDataCoordinator
+from .profiling import device_footprint
 
 
 async def async_get_config_entry_diagnostics(
@@ -14,29 +15,40 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     coordinator: DotDataCoordinator = hass.data[DOMAIN][entry.entry_id]
     devices_diag: dict[str, Any] = {}
+    device_breakers: dict[str, Any] = {}
 
     for device_id, device_data in coordinator.data.items():
         devices_diag[device_id] = {
-            "alias": device_data.alias,
-            "location": device_data.location,
-            "series": device_data.series,
-            "model": device_data.model,
-            "edition": device_data.edition,
-            "firmware_version": device_data.firmware_version,
-            "power_state": device_data.power_state,
-            "power_description": device_data.power_description,
-            "battery_status": device_data.battery_status,
-            "wifi_signal": device_data.wifi_signal,
-            "online": device_data.online,
-            "last_render": device_data.last_render,
-            "next_render_battery": device_data.next_render_battery,
-            "next_render_power": device_data.next_render_power,
-            "screen_rotated": device_data.screen_rotated,
-            "screen_border": device_data.screen_border,
-            "tasks": device_data.tasks,
+            **device_data.as_dict(),
+            "request_key_entry": (
+                coordinator.fleet.keys.get(device_id) if coordinator.fleet else None
+            ),
+            "push_history": [
+                record.as_dict()
+                for record in coordinator.history.records(device_id)
+            ],
+            "footprint_bytes": device_footprint(hass, coordinator, device_id),
+        }
+        device_api = coordinator.api_for(device_id)
+        breaker = device_api.device_breakers.get(device_id)
+        device_breakers[device_id] = {
+            "api_key": device_api.key_breaker.as_dict(),
+            "device": breaker.as_dict() if breaker is not None else None,
         }
 
+    api = coordinator.api
     return {
         "entry_data": {"api_key": "**REDACTED**"},
+        "startup": {
+            "integration": hass.data[DOMAIN].get(DATA_STARTUP, {}),
+            "entry": coordinator.startup_timings,
+        },
+        "status_stream": coordinator.stream.active,
+        "circuit_breakers": {
+            "api_key": api.key_breaker.as_dict(),
+            # Each device's breakers on the key carrying its requests, which
+            # may belong to another entry when devices are shared
+            "devices": device_breakers,
+        },
         "devices": devices_diag,
     }
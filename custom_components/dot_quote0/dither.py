@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+
+from .imaging import BITMAP_THRESHOLD, fit_to_panel
+
+# Error diffusion kernels as (divisor, taps); each tap is (dx, dy, weight)
+# and spreads weight / divisor of a pixel's quantization error to the pixel
+# dx columns right and dy rows below it.
+KERNELS: dict[str, tuple[int, tuple[tuple[int, int, int], ...]]] = {
+    "FLOYD_STEINBERG": (16, (
+        (1, 0, 7),
+        (-1, 1, 3), (0, 1, 5), (1, 1, 1),
+    )),
+    "ATKINSON": (8, (
+        (1, 0, 1), (2, 0, 1),
+        (-1, 1, 1), (0, 1, 1), (1, 1, 1),
+        (0, 2, 1),
+    )),
+    "BURKES": (32, (
+        (1, 0, 8), (2, 0, 4),
+        (-2, 1, 2), (-1, 1, 4), (0, 1, 8), (1, 1, 4), (2, 1, 2),
+    )),
+    "SIERRA2": (16, (
+        (1, 0, 4), (2, 0, 3),
+        (-2, 1, 1), (-1, 1, 2), (0, 1, 3), (1, 1, 2), (2, 1, 1),
+    )),
+    "STUCKI": (42, (
+        (1, 0, 8), (2, 0, 4),
+        (-2, 1, 2), (-1, 1, 4), (0, 1, 8), (1, 1, 4), (2, 1, 2),
+        (-2, 2, 1), (-1, 2, 2), (0, 2, 4), (1, 2, 2), (2, 2, 1),
+    )),
+    "JARVIS_JUDICE_NINKE": (48, (
+        (1, 0, 7), (2, 0, 5),
+        (-2, 1, 3), (-1, 1, 5), (0, 1, 7), (1, 1, 5), (2, 1, 3),
+        (-2, 2, 1), (-1, 2, 3), (0, 2, 5), (1, 2, 3), (2, 2, 1),
+    )),
+    "DIFFUSION_ROW": (1, ((1, 0, 1),)),
+    "DIFFUSION_COLUMN": (1, ((0, 1, 1),)),
+    "DIFFUSION_2D": (2, ((1, 0, 1), (0, 1, 1))),
+    "THRESHOLD": (1, ()),
+}
+
+DEFAULT_KERNEL = "FLOYD_STEINBERG"
+
+# Columns of padding either side of a row, enough for the widest kernel
+_PAD = 2
+
+
+def _bayer(order: int) -> np.ndarray:
+    """Return the 2**order square Bayer matrix, normalized to [0, 1)."""
+    matrix = np.zeros((1, 1), dtype=np.float32)
+    for _ in range(order):
+        matrix = np.block([
+            [4 * matrix, 4 * matrix + 2],
+            [4 * matrix + 3, 4 * matrix + 1],
+        ])
+    return (matrix + 0.5) / matrix.size
+
+
+_BAYER_8X8 = _bayer(3)
+
+
+def threshold(gray: np.ndarray) -> np.ndarray:
+    """Return the 1-bit frame (True is white) of a plain threshold."""
+    return gray >= BITMAP_THRESHOLD
+
+
+def ordered(gray: np.ndarray) -> np.ndarray:
+    """Return the 1-bit frame of an 8x8 Bayer ordered dither.
+
+    Every pixel is compared with its cell of the tiled matrix in a single
+    vectorized comparison.
+    """
+    height, width = gray.shape
+    size = _BAYER_8X8.shape[0]
+    rows = np.arange(height) % size
+    cols = np.arange(width) % size
+    return gray >= _BAYER_8X8[rows[:, None], cols[None, :]] * 255
+
+
+def diffuse(gray: np.ndarray, kernel: str = DEFAULT_KERNEL) -> np.ndarray:
+    """Return the 1-bit frame of an error diffusion dither.
+
+    Only error carried along the current row depends on the pixel before
+    it, so that part runs as a scalar loop over Python floats; the error
+    pushed to the rows below is added for the whole row at once.
+    """
+    divisor, taps = KERNELS[kernel]
+    if not taps:
+        return threshold(gray)
+    height, width = gray.shape
+    same_row = [(dx, weight / divisor) for dx, dy, weight in taps if dy == 0]
+    below = [(dx, dy, weight / divisor) for dx, dy, weight in taps if dy > 0]
+    depth = max((dy for _dx, dy, _weight in below), default=0)
+
+    work = np.zeros((height + depth, width + 2 * _PAD), dtype=np.float64)
+    work[:height, _PAD:_PAD + width] = gray
+    out = np.empty((height, width), dtype=bool)
+    span = range(_PAD, _PAD + width)
+
+    for y in range(height):
+        if not same_row:
+            # No dependency inside the row: quantize it in one step
+            row = work[y, _PAD:_PAD + width]
+            white = row >= BITMAP_THRESHOLD
+            errors = row - white * 255.0
+        else:
+            row = work[y].tolist()
+            errors_list = [0.0] * width
+            white_list = [False] * width
+            for x in span:
+                value = row[x]
+                is_white = value >= BITMAP_THRESHOLD
+                error = value - 255.0 if is_white else value
+                white_list[x - _PAD] = is_white
+                errors_list[x - _PAD] = error
+                for dx, weight in same_row:
+                    row[x + dx] += error * weight
+            white = np.array(white_list)
+            errors = np.array(errors_list)
+        out[y] = white
+        for dx, dy, weight in below:
+            work[y + dy, _PAD + dx:_PAD + dx + width] += errors * weight
+    return out
+
+
+def dither(
+    gray: np.ndarray,
+    dither_type: str = "DIFFUSION",
+    kernel: str | None = None,
+) -> np.ndarray:
+    """Reduce an 8-bit grayscale array to a 1-bit frame like the cloud does."""
+    if dither_type == "ORDERED":
+        return ordered(gray)
+    if dither_type == "NONE":
+        return threshold(gray)
+    return diffuse(gray, kernel or DEFAULT_KERNEL)
+
+
+def dither_image(
+    image: bytes,
+    dither_type: str = "DIFFUSION",
+    kernel: str | None = None,
+) -> bytes:
+    """Dither an image locally and return it as a panel-sized 1-bit PNG.
+
+    The image is fitted to the panel first: a 1-bit pattern scaled down by
+    the cloud afterwards would no longer be a dither. Must run in the
+    executor: decoding and dithering are CPU-bound.
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image)) as img:
+        gray = np.asarray(fit_to_panel(img), dtype=np.float64)
+    frame = Image.fromarray(dither(gray, dither_type, kernel))
+    buffer = io.BytesIO()
+    frame.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
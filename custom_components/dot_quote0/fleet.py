@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api import DotApi
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait after an entry goes away before another entry adopts its
+# devices, so an entry that is merely reloading can take them back first.
+ADOPT_DELAY = 30
+
+
+class DotFleet:
+    """Coordinate devices across every configured API key.
+
+    A device visible to several keys belongs to one entry only, the first
+    one loaded: only that entry polls it and creates its entities. Which
+    key carries the device's requests is chosen separately, spreading shared
+    devices over the keys that can see them so each key's request budget
+    carries a similar number of devices; when a key's rate limit is backed
+    up, requests overflow to another key that can see the device.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._apis: dict[str, DotApi] = {}
+        # entry_id -> device ids its key can see
+        self._visible: dict[str, set[str]] = {}
+        # device_id -> entry_id polling it and owning its entities
+        self.owners: dict[str, str] = {}
+        # device_id -> entry_id whose key normally carries its requests
+        self.keys: dict[str, str] = {}
+        # device_id -> entry_ids whose keys can see it
+        self._candidates: dict[str, list[str]] = {}
+        self._unsub_adopt: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_register(
+        self, entry_id: str, api: DotApi, device_ids: Iterable[str]
+    ) -> set[str]:
+        """Add an entry's key; return the devices the entry should own."""
+        self._apis[entry_id] = api
+        self._visible[entry_id] = set(device_ids)
+        owned: set[str] = set()
+        for device_id in self._visible[entry_id]:
+            owner = self.owners.setdefault(device_id, entry_id)
+            if owner == entry_id:
+                owned.add(device_id)
+            else:
+                _LOGGER.debug(
+                    "Device %s is shared with entry %s, which already polls it",
+                    device_id, owner,
+                )
+        self._rebalance()
+        return owned
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Remove an entry's key and let other entries adopt its devices."""
+        self._apis.pop(entry_id, None)
+        visible = self._visible.pop(entry_id, set())
+        orphaned = [
+            device_id for device_id in visible if self.owners.get(device_id) == entry_id
+        ]
+        for device_id in orphaned:
+            del self.owners[device_id]
+        self._rebalance()
+        if any(
+            device_id in other
+            for device_id in orphaned
+            for other in self._visible.values()
+        ) and self._unsub_adopt is None:
+            self._unsub_adopt = async_call_later(
+                self._hass, ADOPT_DELAY, self._async_adopt_orphans
+            )
+
+    def api_for(self, device_id: str, default: DotApi) -> DotApi:
+        """Return the client whose key should carry requests for device_id.
+
+        That is the device's assigned key, unless its rate limit is backed
+        up and another key that sees the device has more budget left.
+        """
+        if (entry_id := self.keys.get(device_id)) is None:
+            return default
+        api = self._apis[entry_id]
+        if api.backlog > 0:
+            assigned = api
+            api = min(
+                (self._apis[other] for other in self._candidates[device_id]),
+                key=lambda other: (other.backlog, other is not assigned),
+            )
+        return api
+
+    def _rebalance(self) -> None:
+        """Assign each device's requests to the least-loaded key that sees it.
+
+        Devices seen by fewer keys are placed first, so shared devices fill
+        in around each key's exclusive ones. Ties go to the lower entry id,
+        keeping the assignment identical for the same set of entries.
+        """
+        candidates: dict[str, list[str]] = {}
+        for entry_id, device_ids in self._visible.items():
+            for device_id in device_ids:
+                candidates.setdefault(device_id, []).append(entry_id)
+        load = dict.fromkeys(self._visible, 0)
+        keys: dict[str, str] = {}
+        self._candidates = candidates
+        for device_id, entry_ids in sorted(
+            candidates.items(), key=lambda item: (len(item[1]), item[0])
+        ):
+            entry_id = min(entry_ids, key=lambda entry_id: (load[entry_id], entry_id))
+            keys[device_id] = entry_id
+            load[entry_id] += 1
+        self.keys = keys
+
+    @callback
+    def _async_adopt_orphans(self, _now) -> None:
+        self._unsub_adopt = None
+        if self._hass.state is not CoreState.running:
+            return
+        reload: set[str] = set()
+        for entry_id, device_ids in self._visible.items():
+            if any(device_id not in self.owners for device_id in device_ids):
+                reload.add(entry_id)
+        for entry_id in sorted(reload):
+            _LOGGER.debug("Reloading entry %s to adopt devices of a removed entry", entry_id)
+            self._hass.async_create_task(
+                self._hass.config_entries.async_reload(entry_id)
+            )
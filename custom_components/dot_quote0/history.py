@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Push attempts kept per device
+HISTORY_SIZE = 50
+
+OUTCOME_SENT = "sent"
+OUTCOME_FAILED = "failed"
+OUTCOME_QUEUED = "queued"
+OUTCOME_SKIPPED = "skipped"
+
+
+def parse_render_time(value: str | None) -> datetime | None:
+    """Parse a render timestamp reported by the cloud."""
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return parsed
+
+
+@dataclass(slots=True)
+class PushRecord:
+    """One push attempt to a device."""
+
+    kind: str
+    task_key: str | None
+    started: datetime
+    outcome: str
+    refresh_now: bool = False
+    latency: float | None = None
+    error: str | None = None
+    rendered_at: datetime | None = None
+
+    @property
+    def render_latency(self) -> float | None:
+        """Seconds from the push to the panel reporting a new render."""
+        if self.rendered_at is None:
+            return None
+        return max(0.0, (self.rendered_at - self.started).total_seconds())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "task_key": self.task_key,
+            "started": self.started.isoformat(),
+            "outcome": self.outcome,
+            "refresh_now": self.refresh_now,
+            "latency": self.latency,
+            "error": self.error,
+            "rendered_at": self.rendered_at.isoformat() if self.rendered_at else None,
+            "render_latency": self.render_latency,
+        }
+
+
+class PushHistory:
+    """Bounded per-device log of push attempts and their outcomes."""
+
+    def __init__(self) -> None:
+        self._records: dict[str, deque[PushRecord]] = {}
+
+    def add(self, device_id: str, record: PushRecord) -> None:
+        if device_id not in self._records:
+            self._records[device_id] = deque(maxlen=HISTORY_SIZE)
+        self._records[device_id].append(record)
+
+    def records(self, device_id: str) -> list[PushRecord]:
+        return list(self._records.get(device_id, ()))
+
+    def note_render(self, device_id: str, last_render: str | None) -> None:
+        """Attribute a new last_render to the sent pushes it displays."""
+        rendered_at = parse_render_time(last_render) or dt_util.now()
+        for record in reversed(self._records.get(device_id, ())):
+            if record.rendered_at is not None:
+                break
+            if record.outcome == OUTCOME_SENT and record.started <= rendered_at:
+                record.rendered_at = rendered_at
+
+    def last_rendered(self, device_id: str) -> PushRecord | None:
+        """Return the most recent push that has been seen on screen."""
+        for record in reversed(self._records.get(device_id, ())):
+            if record.rendered_at is not None:
+                return record
+        return None
+
+    def last(self, device_id: str) -> PushRecord | None:
+        records = self._records.get(device_id)
+        return records[-1] if records else None
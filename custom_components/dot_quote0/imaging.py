@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+from dataclasses import dataclass
+
+from .api import base64_text
+
+PANEL_WIDTH = 296
+PANEL_HEIGHT = 152
+
+# Luminance at or above this is rendered as a white pixel.
+BITMAP_THRESHOLD = 128
+
+
+@dataclass(frozen=True, slots=True)
+class Bitmap:
+    """Packed 1-bit frame as shown on the e-paper panel."""
+
+    size: tuple[int, int]
+    bits: int
+
+    @property
+    def pixels(self) -> int:
+        return self.size[0] * self.size[1]
+
+
+def fit_to_panel(img):
+    """Return img as grayscale, scaled to fit the panel and centred on white.
+
+    Images that already match the panel are only converted.
+    """
+    from PIL import Image, ImageOps
+
+    gray = img.convert("L")
+    if gray.size == (PANEL_WIDTH, PANEL_HEIGHT):
+        return gray
+    return ImageOps.pad(
+        gray, (PANEL_WIDTH, PANEL_HEIGHT), method=Image.LANCZOS, color=255
+    )
+
+
+def panel_png(image: bytes | str) -> bytes:
+    """Return an image, raw or base64, as a PNG fitted to the panel.
+
+    Used to keep pushed images compactly; a PNG that already matches the
+    panel is returned as it is. Must run in the executor.
+    """
+    from PIL import Image
+
+    data = base64.b64decode(base64_text(image)) if isinstance(image, str) else image
+    with Image.open(io.BytesIO(data)) as img:
+        if img.format == "PNG" and img.size == (PANEL_WIDTH, PANEL_HEIGHT):
+            return data
+        fitted = fit_to_panel(img)
+    buffer = io.BytesIO()
+    fitted.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def to_bitmap(image: bytes) -> Bitmap:
+    """Decode an image and reduce it to a thresholded 1-bit panel bitmap.
+
+    The image is fitted to the panel first, so changed pixels are counted
+    in panel pixels whatever the source resolution. Must run in the
+    executor: decoding is CPU-bound.
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image)) as img:
+        mono = fit_to_panel(img).point(
+            lambda v: 255 if v >= BITMAP_THRESHOLD else 0, mode="1"
+        )
+    # Pack the rows into one big integer so a whole frame can be compared
+    # with a single XOR and popcount instead of a per-pixel loop.
+    return Bitmap(mono.size, int.from_bytes(mono.tobytes(), "big"))
+
+
+def b64_to_bitmap(image_data: str) -> Bitmap:
+    """Decode base64 image data into a 1-bit bitmap."""
+    return to_bitmap(base64.b64decode(base64_text(image_data)))
+
+
+def changed_pixels(previous: Bitmap | None, current: Bitmap) -> int:
+    """Return how many pixels differ between two frames.
+
+    Frames of different sizes, or no previous frame, count as fully changed.
+    """
+    if previous is None or previous.size != current.size:
+        return current.pixels
+    return (previous.bits ^ current.bits).bit_count()
+
+
+@dataclass(frozen=True, slots=True)
+class StagedImage:
+    """Image held in memory for a device until the Send Image button is pressed."""
+
+    data: bytes
+    digest: str
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> StagedImage:
+        return cls(data, hashlib.sha256(data).hexdigest()[:12])
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Approximate geometry of the Text API's layout on the 296x152 panel, in
+# pixels. The message area sits between the title and the signature.
+TITLE_WIDTH = 264
+MESSAGE_WIDTH = 272
+MESSAGE_HEIGHT = 90
+LINE_HEIGHT = 18
+MAX_MESSAGE_LINES = MESSAGE_HEIGHT // LINE_HEIGHT
+
+# Advance widths of the panel's proportional font at message size; other
+# ASCII characters use DEFAULT_WIDTH, full-width characters WIDE_WIDTH.
+DEFAULT_WIDTH = 7
+WIDE_WIDTH = 14
+CHAR_WIDTHS: dict[str, int] = {
+    **dict.fromkeys("il.,:;'|!`", 3),
+    **dict.fromkeys("fjrtI()[]{} -\"/\\", 4),
+    **dict.fromkeys("abcdeghknopqsuvxyz0123456789", 7),
+    **dict.fromkeys("ABCDEFGHJKLNOPQRSTUVXYZ?$#&*+<=>^_~", 8),
+    **dict.fromkeys("mwMW%@", 11),
+}
+
+ELLIPSIS = "…"
+
+# Tried word by word, in order, on lines that do not fit
+ABBREVIATIONS: dict[str, str] = {
+    "Monday": "Mon",
+    "Tuesday": "Tue",
+    "Wednesday": "Wed",
+    "Thursday": "Thu",
+    "Friday": "Fri",
+    "Saturday": "Sat",
+    "Sunday": "Sun",
+    "Tomorrow": "Tmrw",
+    "All day": "All-day",
+    "Partlycloudy": "Pt cloudy",
+    "Partly Cloudy": "Pt cloudy",
+    "Clear-Night": "Clear",
+    "Clear Night": "Clear",
+    "Lightning-Rainy": "Storm",
+    "Lightning Rainy": "Storm",
+    "Snowy-Rainy": "Sleet",
+    "Snowy Rainy": "Sleet",
+    "Temperature": "Temp",
+    "Humidity": "Hum",
+    "Appointment": "Appt",
+    "Meeting": "Mtg",
+    "Conference": "Conf",
+    "Birthday": "Bday",
+    "and": "&",
+}
+
+_ABBREVIATION_RE = re.compile(
+    "|".join(rf"\b{re.escape(word)}\b" for word in ABBREVIATIONS)
+)
+_SPACES_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def char_width(char: str) -> int:
+    if (width := CHAR_WIDTHS.get(char)) is not None:
+        return width
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return WIDE_WIDTH
+    if unicodedata.combining(char):
+        return 0
+    return DEFAULT_WIDTH
+
+
+def text_width(text: str) -> int:
+    """Return the rendered width of a line in pixels."""
+    return sum(char_width(char) for char in text)
+
+
+@lru_cache(maxsize=256)
+def fit_line(text: str, max_width: int = MESSAGE_WIDTH) -> str:
+    """Return text shortened to fit max_width on one line.
+
+    Whitespace is collapsed first, then common words are abbreviated, and
+    only then is the line cut at a word boundary (or mid-word for a single
+    long word) and ended with an ellipsis.
+    """
+    text = _SPACES_RE.sub(" ", text).strip()
+    if text_width(text) <= max_width:
+        return text
+    text = _ABBREVIATION_RE.sub(lambda match: ABBREVIATIONS[match[0]], text)
+    if text_width(text) <= max_width:
+        return text
+
+    budget = max_width - char_width(ELLIPSIS)
+    width = 0
+    cut = 0
+    for index, char in enumerate(text):
+        width += char_width(char)
+        if width > budget:
+            break
+        cut = index + 1
+    head = text[:cut]
+    # Prefer ending on a whole word when that keeps most of the line
+    if (space := head.rfind(" ")) > cut // 2:
+        head = head[:space]
+    return head.rstrip(" ,;:-") + ELLIPSIS
+
+
+@lru_cache(maxsize=128)
+def fit_message(
+    head: tuple[str, ...],
+    items: tuple[str, ...],
+    more: bool = True,
+    max_lines: int = MAX_MESSAGE_LINES,
+    max_width: int = MESSAGE_WIDTH,
+) -> str:
+    """Lay out a message so it fits the panel's message area.
+
+    head lines are always kept; items fill the remaining lines in order.
+    With more, items that do not fit are summarized on a last "+N more"
+    line. Layouts are cached by their content, so pushing unchanged content
+    again costs no measuring.
+    """
+    lines = [fit_line(line, max_width) for line in head[:max_lines]]
+    room = max_lines - len(lines)
+    if len(items) > room and more and room > 0:
+        shown = room - 1
+        lines.extend(fit_line(item, max_width) for item in items[:shown])
+        lines.append(f"+{len(items) - shown} more")
+    else:
+        lines.extend(fit_line(item, max_width) for item in items[:room])
+    return "\n".join(lines)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import DotApiError
+
+if TYPE_CHECKING:
+    from .coordinator import DotDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+TEXT_ITEM_FIELDS = ("title", "message", "signature", "icon", "link")
+
+
+def _item_digest(item: dict[str, Any]) -> str:
+    content = {key: item[key] for key in TEXT_ITEM_FIELDS if item.get(key) is not None}
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True).encode()
+    ).hexdigest()
+
+
+def text_task_keys(tasks: list[dict[str, Any]]) -> list[str]:
+    """Return the task keys of the Text API tasks in a device's loop."""
+    keys: list[str] = []
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        key = task.get("taskKey") or task.get("key")
+        task_type = str(task.get("type", "text")).lower()
+        if key and "text" in task_type:
+            keys.append(str(key))
+    return keys
+
+
+class DotPlaylists:
+    """Upload rotating content once and cycle it on the device.
+
+    Each playlist item lives in its own Text API task. Items are only
+    re-uploaded when their content changed, and rotation uses the cheap
+    switch-next call (or the device's own loop) instead of pushing content.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: DotDataCoordinator) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        # (device_id, taskKey) -> digest of the content last uploaded there
+        self._uploaded: dict[tuple[str, str], str] = {}
+        self._unsub_rotate: dict[str, CALLBACK_TYPE] = {}
+
+    async def async_set(
+        self,
+        device_id: str,
+        items: list[dict[str, Any]],
+        task_keys: list[str] | None = None,
+        rotate_interval: timedelta | None = None,
+    ) -> int:
+        """Upload a playlist and (re)start its rotation. Return uploads made."""
+        if not task_keys:
+            data = self._coordinator.data.get(device_id)
+            task_keys = text_task_keys(data.tasks if data else [])
+        if len(task_keys) < len(items):
+            raise DotApiError(
+                f"Playlist has {len(items)} items but device '{device_id}' only has "
+                f"{len(task_keys)} Text API tasks. Add more in the Dot. app or pass task_keys."
+            )
+
+        uploads = 0
+        for item, task_key in zip(items, task_keys):
+            digest = _item_digest(item)
+            if self._uploaded.get((device_id, task_key)) == digest:
+                continue
+            sent = await self._coordinator.delivery.async_send(
+                device_id,
+                "text",
+                False,
+                taskKey=task_key,
+                **{key: item.get(key) for key in TEXT_ITEM_FIELDS},
+            )
+            # Queued content may still be dropped, so only count real uploads
+            if sent:
+                self._uploaded[(device_id, task_key)] = digest
+            uploads += 1
+        _LOGGER.debug(
+            "Playlist for %s: %d of %d items uploaded", device_id, uploads, len(items)
+        )
+
+        self.async_stop(device_id)
+        if rotate_interval:
+            self._unsub_rotate[device_id] = async_track_time_interval(
+                self._hass, self._make_rotate_callback(device_id), rotate_interval
+            )
+        return uploads
+
+    @callback
+    def async_invalidate(self, device_id: str, task_key: str | None) -> None:
+        """Forget what was uploaded to a task that is being overwritten."""
+        self._uploaded.pop((device_id, task_key), None)
+
+    @callback
+    def async_stop(self, device_id: str) -> None:
+        """Stop rotating a device's playlist; its content stays uploaded."""
+        if unsub := self._unsub_rotate.pop(device_id, None):
+            unsub()
+
+    @callback
+    def async_cancel(self) -> None:
+        for unsub in self._unsub_rotate.values():
+            unsub()
+        self._unsub_rotate.clear()
+
+    def _make_rotate_callback(self, device_id: str):
+        async def _rotate(_now: datetime) -> None:
+            try:
+                await self._coordinator.api_for(device_id).switch_next_content(device_id)
+            except DotApiError as err:
+                _LOGGER.debug("Could not rotate playlist on %s: %s", device_id, err)
+
+        return _rotate
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+if TYPE_CHECKING:
+    from .coordinator import DotDataCoordinator
+
+PACKAGE_DIR = Path(__file__).parent
+
+# Subsystem that allocations made in each of the integration's modules
+# are reported under
+SUBSYSTEMS: dict[str, str] = {
+    "coordinator.py": "coordinator data",
+    "api.py": "api client",
+    "stream.py": "api client",
+    "fleet.py": "api client",
+    "delivery.py": "queues",
+    "playlist.py": "queues",
+    "history.py": "push history",
+    "scenes.py": "scenes",
+    "services.py": "services",
+    "imaging.py": "image caches",
+    "dither.py": "image caches",
+    "resolver.py": "image caches",
+    "sensor.py": "entity state",
+    "binary_sensor.py": "entity state",
+    "button.py": "entity state",
+    "select.py": "entity state",
+    "text.py": "entity state",
+}
+
+# Frames kept per allocation, so memory Home Assistant core or aiohttp
+# allocates on the integration's behalf can be traced back to it
+TRACE_FRAMES = 25
+
+# Held for a whole profiling run, so one run cannot stop tracing while
+# another is still waiting for its snapshot
+_PROFILE_LOCK = asyncio.Lock()
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Estimate the memory held by an object and everything it references."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def device_footprint(
+    hass: HomeAssistant, coordinator: DotDataCoordinator, device_id: str
+) -> dict[str, int]:
+    """Estimate the bytes each subsystem holds for one device."""
+    data = (coordinator.data or {}).get(device_id)
+    entry = coordinator.config_entry
+    states = [
+        hass.states.get(entity.entity_id)
+        for entity in (
+            er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+            if entry is not None else ()
+        )
+        if entity.unique_id.startswith(f"{device_id}_")
+    ]
+    # Measured with one seen set: objects shared between categories, such
+    # as the status bodies held by both the coordinator and the API
+    # client's conditional cache, are counted once, under the first one.
+    # The roots are all built first, so no temporary is freed and its id
+    # reused while measuring.
+    roots: dict[str, list[Any]] = {
+        "coordinator_data": [data] if data is not None else [],
+        "entity_state": [state.as_dict() for state in states if state is not None],
+        "image_caches": [
+            [frame for key, frame in coordinator.frames.items() if key[0] == device_id],
+            coordinator.staged_images.get(device_id),
+        ],
+        "queues": coordinator.delivery.pending(device_id),
+        "last_sent": coordinator.delivery.last_sent(device_id),
+        "push_history": coordinator.history.records(device_id),
+        "conditional_cache": coordinator.api_for(device_id).conditional_entries(
+            device_id
+        ),
+    }
+    seen: set[int] = {id(root) for root in roots.values()}
+    footprint = {
+        category: sum(deep_sizeof(obj, seen) for obj in objects)
+        for category, objects in roots.items()
+    }
+    footprint["total"] = sum(footprint.values())
+    # Breakdown of coordinator_data, not part of the total
+    footprint["tasks"] = deep_sizeof(data.tasks) if data is not None else 0
+    footprint["current_images"] = (
+        deep_sizeof(data.current_images) if data is not None else 0
+    )
+    return footprint
+
+
+def _package_frame(traceback: tracemalloc.Traceback) -> tracemalloc.Frame:
+    """Return the innermost frame of a traceback inside the integration."""
+    for frame in reversed(traceback):
+        if Path(frame.filename).parent == PACKAGE_DIR:
+            return frame
+    return traceback[-1]
+
+
+def _allocations(snapshot: tracemalloc.Snapshot, top: int) -> dict[str, Any]:
+    # Keep allocations with the integration anywhere in their stack, and
+    # charge each to the integration's line closest to the allocation
+    snapshot = snapshot.filter_traces(
+        [tracemalloc.Filter(True, str(PACKAGE_DIR / "*"), all_frames=True)]
+    )
+    subsystems: dict[str, int] = {}
+    lines: dict[tuple[str, int], list[int]] = {}
+    for stat in snapshot.statistics("traceback"):
+        frame = _package_frame(stat.traceback)
+        name = Path(frame.filename).name
+        if name == "profiling.py":
+            # The profiler's own snapshot
+            continue
+        subsystem = SUBSYSTEMS.get(name, "other")
+        subsystems[subsystem] = subsystems.get(subsystem, 0) + stat.size
+        totals = lines.setdefault((name, frame.lineno), [0, 0])
+        totals[0] += stat.size
+        totals[1] += stat.count
+    return {
+        "subsystems": dict(sorted(subsystems.items(), key=lambda item: -item[1])),
+        "top": [
+            {"location": f"{name}:{lineno}", "size": size, "count": count}
+            for (name, lineno), (size, count) in sorted(
+                lines.items(), key=lambda item: -item[1][0]
+            )[:top]
+        ],
+    }
+
+
+async def async_profile(hass: HomeAssistant, seconds: float, top: int) -> dict[str, Any]:
+    """Trace allocations for a while; report what the integration still holds.
+
+    Only memory allocated while tracing is seen. If tracemalloc was already
+    running (for example started by the profiler integration), it is left
+    running, everything it traced so far is included, and allocations are
+    attributed only as deep as its traceback limit allows. Overlapping
+    calls run one after another.
+    """
+    async with _PROFILE_LOCK:
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(TRACE_FRAMES)
+        try:
+            await asyncio.sleep(seconds)
+            snapshot = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+        finally:
+            if started_here:
+                tracemalloc.stop()
+    return await hass.async_add_executor_job(_allocations, snapshot, top)
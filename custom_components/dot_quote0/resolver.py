@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, split_entity_id, valid_entity_id
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import REQUEST_TIMEOUT, DotApiError, base64_text
+
+_T = TypeVar("_T")
+
+# Executor jobs (file reads, decoding, dithering) running at once for image
+# pushes; the rest wait here instead of occupying Home Assistant's executor.
+MAX_EXECUTOR_JOBS = 2
+
+# Largest image accepted from a URL or file
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+# Longest value treated as a file path; base64 image data (which may also
+# start with "/") is far longer than any real path.
+MAX_PATH_LENGTH = 4096
+
+MEDIA_SOURCE_PREFIX = "media-source://"
+LOCAL_MEDIA_PREFIX = "media-source://media_source/"
+
+
+def is_image_entity(value: str) -> bool:
+    """Return True if the value names a camera or image entity."""
+    return valid_entity_id(value) and split_entity_id(value)[0] in (
+        "camera", "image",
+    )
+
+
+def _is_url(value: str) -> bool:
+    return value.startswith(("http://", "https://"))
+
+
+def _is_path(value: str) -> bool:
+    return value.startswith(("/", "./")) and len(value) <= MAX_PATH_LENGTH
+
+
+def decode_base64(data: str) -> bytes:
+    try:
+        return base64.b64decode(base64_text(data), validate=True)
+    except ValueError as err:
+        raise DotApiError("Image is not valid base64 data") from err
+
+
+def _read_file(path: Path) -> bytes:
+    if not path.is_file():
+        raise DotApiError(f"Image file not found: {path}")
+    if path.stat().st_size > MAX_IMAGE_BYTES:
+        raise DotApiError(f"Image file is too large: {path}")
+    return path.read_bytes()
+
+
+class ImageResolver:
+    """Turn an image reference into image data for a push.
+
+    Accepts camera and image entities, http(s) URLs fetched through Home
+    Assistant's shared session, media-source URIs, file paths inside
+    allowlist_external_dirs, and base64 data. Blocking work goes through a
+    small executor queue shared by every entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._executor_slots = asyncio.Semaphore(MAX_EXECUTOR_JOBS)
+
+    async def async_add_executor_job(
+        self, target: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run a blocking image job once an executor slot is free."""
+        async with self._executor_slots:
+            return await self._hass.async_add_executor_job(target, *args)
+
+    async def async_resolve(self, value: str) -> bytes | str:
+        """Return raw image bytes, or base64 data unchanged.
+
+        Base64 strings are passed through so they can be spliced into the
+        request body without a decode and re-encode.
+        """
+        if is_image_entity(value):
+            return await self._async_entity_image(value)
+        if _is_url(value):
+            return await self._async_fetch(value)
+        if value.startswith(MEDIA_SOURCE_PREFIX):
+            return await self._async_media_source(value)
+        if _is_path(value):
+            return await self._async_read_path(Path(self._hass.config.path(value)))
+        return value
+
+    async def async_resolve_bytes(self, value: str) -> bytes:
+        """Return raw image bytes for any supported reference."""
+        data = await self.async_resolve(value)
+        return data if isinstance(data, bytes) else decode_base64(data)
+
+    async def _async_read_path(self, path: Path) -> bytes:
+        if not self._hass.config.is_allowed_path(str(path)):
+            raise DotApiError(
+                f"Image path {path} is not in allowlist_external_dirs"
+            )
+        return await self.async_add_executor_job(_read_file, path)
+
+    async def _async_fetch(self, url: str) -> bytes:
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.get(url, timeout=REQUEST_TIMEOUT) as resp:
+                if resp.status != 200:
+                    raise DotApiError(f"Could not fetch image {url}: HTTP {resp.status}")
+                if (resp.content_length or 0) > MAX_IMAGE_BYTES:
+                    raise DotApiError(f"Image at {url} is too large")
+                data = bytearray()
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    data += chunk
+                    if len(data) > MAX_IMAGE_BYTES:
+                        raise DotApiError(f"Image at {url} is too large")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise DotApiError(f"Could not fetch image {url}: {err}") from err
+        return bytes(data)
+
+    async def _async_media_source(self, uri: str) -> bytes:
+        if uri.startswith(LOCAL_MEDIA_PREFIX):
+            # Local media maps straight onto a media directory; read it
+            # from disk rather than through the HTTP server.
+            source_dir_id, _, location = uri[len(LOCAL_MEDIA_PREFIX):].partition("/")
+            if source_dir := self._hass.config.media_dirs.get(source_dir_id):
+                return await self._async_read_path(Path(source_dir, location))
+
+        from homeassistant.components import media_source
+        from homeassistant.components.media_player.browse_media import (
+            async_process_play_media_url,
+        )
+
+        try:
+            media = await media_source.async_resolve_media(self._hass, uri, None)
+        except HomeAssistantError as err:
+            raise DotApiError(f"Could not resolve {uri}: {err}") from err
+        return await self._async_fetch(
+            async_process_play_media_url(self._hass, media.url)
+        )
+
+    async def _async_entity_image(self, entity_id: str) -> bytes:
+        """Fetch the current picture of a camera or image entity in memory."""
+        if split_entity_id(entity_id)[0] == "camera":
+            from homeassistant.components.camera import async_get_image
+
+            try:
+                image = await async_get_image(self._hass, entity_id)
+            except HomeAssistantError as err:
+                raise DotApiError(
+                    f"Could not get image from {entity_id}: {err}"
+                ) from err
+            return image.content
+
+        component = self._hass.data.get("image")
+        entity = component.get_entity(entity_id) if component else None
+        if entity is None:
+            raise DotApiError(f"Image entity not found: {entity_id}")
+        content = await entity.async_image()
+        if content is None:
+            raise DotApiError(f"Image entity {entity_id} has no image")
+        return content
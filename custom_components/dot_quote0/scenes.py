@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import DotApiError
+from .const import DATA_RESOLVER, DOMAIN
+from .imaging import panel_png
+
+if TYPE_CHECKING:
+    from .coordinator import DotDataCoordinator
+    from .resolver import ImageResolver
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "dot_quote0.scenes"
+STORAGE_VERSION = 1
+
+# Directory under .storage holding the scenes' images as PNG files
+IMAGE_DIR = "dot_quote0_scenes"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _write_images(directory: Path, images: dict[str, bytes]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for digest, image in images.items():
+        path = directory / f"{digest}.png"
+        if not path.exists():
+            path.write_bytes(image)
+
+
+def _remove_images(directory: Path, keep: set[str]) -> None:
+    if not directory.is_dir():
+        return
+    for path in directory.glob("*.png"):
+        if path.stem not in keep:
+            path.unlink(missing_ok=True)
+
+
+def _read_images(directory: Path, digests: set[str]) -> dict[str, bytes]:
+    images = {}
+    for digest in digests:
+        path = directory / f"{digest}.png"
+        if not path.is_file():
+            raise DotApiError(f"Scene image {digest} is missing from {directory}")
+        images[digest] = path.read_bytes()
+    return images
+
+
+class DotScenes:
+    """Named snapshots of what several panels were last sent.
+
+    A scene maps each device to the pushes that last went to each of its
+    tasks, with images already fitted to the panel, so restoring it costs
+    uploads only. Scenes and text are kept in a Store; images are kept as
+    PNG files next to it, once per content, so an image sent to twenty
+    panels is stored once and only read back when a scene is restored.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._image_dir = Path(hass.config.path(".storage", IMAGE_DIR))
+        # digest -> {"kind", "payload" without image, "image": image digest}
+        self._payloads: dict[str, dict[str, Any]] = {}
+        self._scenes: dict[str, dict[str, list[str]]] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        # Held while scenes change or their images are read back, so
+        # pruning never removes what another call is using
+        self._lock = asyncio.Lock()
+
+    async def _async_load(self) -> None:
+        # Loaded on first use so scenes never slow down startup
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if data := await self._store.async_load():
+                self._payloads = data.get("payloads", {})
+                self._scenes = data.get("scenes", {})
+            self._loaded = True
+
+    async def _async_save(self) -> None:
+        """Prune unused payloads and images and save; hold self._lock."""
+        used = {
+            digest
+            for scene in self._scenes.values()
+            for digests in scene.values()
+            for digest in digests
+        }
+        self._payloads = {
+            digest: item for digest, item in self._payloads.items() if digest in used
+        }
+        await self._store.async_save({"payloads": self._payloads, "scenes": self._scenes})
+        images = {item["image"] for item in self._payloads.values() if "image" in item}
+        await self._hass.async_add_executor_job(_remove_images, self._image_dir, images)
+
+    async def async_snapshot(
+        self, name: str, coordinators: dict[str, DotDataCoordinator]
+    ) -> dict[str, int]:
+        """Save what each device in coordinators was last sent as a scene.
+
+        Return the number of pushes captured per device; devices that were
+        sent nothing since startup are left out.
+        """
+        await self._async_load()
+        resolver: ImageResolver = self._hass.data[DOMAIN][DATA_RESOLVER]
+        scene: dict[str, list[str]] = {}
+        items: dict[str, dict[str, Any]] = {}
+        images: dict[str, bytes] = {}
+        # Image sent -> its panel PNG, so a broadcast image is fitted once
+        fitted: dict[bytes | str, bytes] = {}
+        for device_id, coordinator in coordinators.items():
+            digests = []
+            for (kind, _task_key), payload in coordinator.delivery.last_sent(device_id):
+                payload = dict(payload)
+                item: dict[str, Any] = {"kind": kind, "payload": payload}
+                if (image := payload.pop("image", None)) is not None:
+                    # Fitted to the panel only now, for the pushes kept
+                    if image not in fitted:
+                        try:
+                            fitted[image] = await resolver.async_add_executor_job(
+                                panel_png, image
+                            )
+                        except (OSError, ValueError) as err:
+                            _LOGGER.debug(
+                                "Leaving unreadable image of %s out: %s", device_id, err
+                            )
+                            continue
+                    image = fitted[image]
+                    item["image"] = _digest(image)
+                    images[item["image"]] = image
+                digest = _digest(json.dumps(item, sort_keys=True).encode())
+                items[digest] = item
+                digests.append(digest)
+            if digests:
+                scene[device_id] = digests
+        if not scene:
+            raise DotApiError(
+                "Nothing has been sent to these devices since Home Assistant started."
+            )
+        async with self._lock:
+            await self._hass.async_add_executor_job(
+                _write_images, self._image_dir, images
+            )
+            for digest, item in items.items():
+                self._payloads.setdefault(digest, item)
+            self._scenes[name] = scene
+            await self._async_save()
+        return {device_id: len(digests) for device_id, digests in scene.items()}
+
+    async def async_delete(self, name: str) -> None:
+        await self._async_load()
+        async with self._lock:
+            if self._scenes.pop(name, None) is None:
+                raise DotApiError(f"Scene '{name}' not found.")
+            await self._async_save()
+
+    async def async_restore(
+        self, name: str, coordinators: dict[str, DotDataCoordinator]
+    ) -> dict[str, int]:
+        """Push a scene to the devices in coordinators, all at once.
+
+        Devices the scene has no content for are left alone. Each device's
+        pushes go out in their original order through its delivery policy,
+        and only the last one refreshes the screen. Return the number of
+        pushes sent or queued per device.
+        """
+        await self._async_load()
+        async with self._lock:
+            if (scene := self._scenes.get(name)) is None:
+                raise DotApiError(f"Scene '{name}' not found.")
+            targets = {
+                device_id: coordinator
+                for device_id, coordinator in coordinators.items()
+                if device_id in scene
+            }
+            if not targets:
+                raise DotApiError(f"Scene '{name}' has no content for these devices.")
+            payloads = {
+                device_id: [self._payloads[digest] for digest in scene[device_id]]
+                for device_id in targets
+            }
+            images = await self._hass.async_add_executor_job(
+                _read_images,
+                self._image_dir,
+                {
+                    item["image"]
+                    for items in payloads.values()
+                    for item in items
+                    if "image" in item
+                },
+            )
+
+        async def _restore(device_id: str, coordinator: DotDataCoordinator) -> None:
+            items = payloads[device_id]
+            for index, item in enumerate(items):
+                payload = dict(item["payload"])
+                if "image" in item:
+                    payload["image"] = images[item["image"]]
+                await coordinator.delivery.async_send(
+                    device_id, item["kind"], index == len(items) - 1, **payload
+                )
+
+        results = await asyncio.gather(
+            *(
+                _restore(device_id, coordinator)
+                for device_id, coordinator in targets.items()
+            ),
+            return_exceptions=True,
+        )
+        failed = []
+        for device_id, result in zip(targets, results):
+            if isinstance(result, DotApiError):
+                _LOGGER.warning(
+                    "Failed to restore scene '%s' on %s: %s", name, device_id, result
+                )
+                failed.append(device_id)
+            elif isinstance(result, BaseException):
+                raise result
+        if failed:
+            raise DotApiError(
+                f"Scene '{name}' could not be restored on {', '.join(failed)}."
+            )
+        return {device_id: len(payloads[device_id]) for device_id in targets}
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import zlib
+
+# Share of a device's slot that its deterministic jitter may shift it by
+JITTER_FRACTION = 0.5
+
+
+def _fraction(value: str) -> float:
+    """Map a string to a stable number in [0, 1), identical across restarts."""
+    return zlib.crc32(value.encode()) / 2**32
+
+
+def device_jitter(device_id: str) -> float:
+    """Return a device's stable jitter, as a share of its slot.
+
+    Ranges over JITTER_FRACTION, centered on zero.
+    """
+    return (_fraction(device_id) - 0.5) * JITTER_FRACTION
+
+
+def entry_phase(entry_id: str, interval: float) -> float:
+    """Return the delay before a config entry's first scheduled poll.
+
+    Every entry gets its own phase within the interval, so several entries
+    restarted together do not keep polling on the same second.
+    """
+    return _fraction(entry_id) * interval or interval
+
+
+def poll_offsets(
+    entry_id: str, device_ids: list[str], interval: float
+) -> dict[str, float]:
+    """Return the delay before each device's first scheduled poll.
+
+    Devices are spaced evenly across the interval, the group is rotated by
+    the entry's phase and each device is nudged by a jitter derived from its
+    id. Subsequent polls repeat every interval, keeping the same spread.
+    """
+    count = len(device_ids)
+    phase = _fraction(entry_id)
+    offsets: dict[str, float] = {}
+    for index, device_id in enumerate(sorted(device_ids)):
+        slot = (phase + (index + device_jitter(device_id)) / count) % 1.0
+        offsets[device_id] = slot * interval or interval
+    return offsets
@@ -5,13 +5,18 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER
+from .const import (
+    DELIVERY_IMMEDIATE,
+    DELIVERY_POLICIES,
+    DITHER_TYPES,
+    DOMAIN,
+    MANUFACTURER,
+)
 from .coordinator import DotDataCoordinator
 
-DITHER_OPTIONS = ["DIFFUSION", "ORDERED", "NONE"]
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -19,10 +24,11 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: DotDataCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = [
-        DotDitherTypeSelect(coordinator, device_id)
-        for device_id in coordinator.data
-    ]
+    entities: list[SelectEntity] = []
+    for device_id in coordinator.data:
+        device_coordinator = coordinator.for_device(device_id)
+        entities.append(DotDitherTypeSelect(device_coordinator, device_id))
+        entities.append(DotDeliveryPolicySelect(device_coordinator, device_id))
     async_add_entities(entities)
 
 
@@ -32,7 +38,7 @@ class DotDitherTypeSelect(CoordinatorEntity[DotDataCoordinator], SelectEntity):
     _attr_has_entity_name = True
     _attr_name = "Dither Type"
     _attr_icon = "mdi:blur"
-    _attr_options = DITHER_OPTIONS
+    _attr_options = DITHER_TYPES
     _attr_current_option = "DIFFUSION"
 
     def __init__(
@@ -59,3 +65,61 @@ class DotDitherTypeSelect(CoordinatorEntity[DotDataCoordinator], SelectEntity):
     async def async_select_option(self, option: str) -> None:
         self._attr_current_option = option
         self.async_write_ha_state()
+
+
+class DotDeliveryPolicySelect(
+    CoordinatorEntity[DotDataCoordinator], SelectEntity, RestoreEntity
+):
+    """Select entity for when pushes reach the panel.
+
+    immediate refreshes on every push, batched holds pushes until the next
+    scheduled render and quiet_hours holds them until the window ends.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Delivery Policy"
+    _attr_icon = "mdi:send-clock"
+    _attr_options = DELIVERY_POLICIES
+
+    def __init__(
+        self, coordinator: DotDataCoordinator, device_id: str
+    ) -> None:
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._attr_unique_id = f"{device_id}_delivery_policy"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        data = self.coordinator.data.get(self._device_id)
+        model_name = "Quote/0"
+        if data:
+            model_name = f"Quote/0 (Edition {data.edition})"
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device_id)},
+            name=data.display_name if data else f"Quote/0 {self._device_id[-4:]}",
+            manufacturer=MANUFACTURER,
+            model=model_name,
+            sw_version=data.firmware_version if data else None,
+        )
+
+    @property
+    def current_option(self) -> str:
+        return self.coordinator.delivery.policies.get(
+            self._device_id, DELIVERY_IMMEDIATE
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        return {"pending": self.coordinator.delivery.pending_count(self._device_id)}
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state in DELIVERY_POLICIES:
+            self.coordinator.delivery.policies[self._device_id] = last_state.state
+
+    async def async_select_option(self, option: str) -> None:
+        self.coordinator.delivery.policies[self._device_id] = option
+        if option == DELIVERY_IMMEDIATE:
+            await self.coordinator.delivery.async_flush(self._device_id)
+        self.async_write_ha_state()
@@ -2,27 +2,34 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT
-from homeassistant.core import HomeAssistant
+from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MANUFACTURER
 from .coordinator import DotDataCoordinator, DotDeviceData
+from .throttle import WriteThrottle
 
 
 @dataclass(frozen=True, kw_only=True)
 class DotSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[DotDeviceData], Any]
+    # Smallest change of a numeric value worth a state write
+    deadband: float | None = None
+    # Changes arriving sooner than this after the last write are dropped
+    min_write_interval: timedelta | None = None
 
 
 SENSOR_DESCRIPTIONS: tuple[DotSensorEntityDescription, ...] = (
@@ -48,6 +55,9 @@ SENSOR_DESCRIPTIONS: tuple[DotSensorEntityDescription, ...] = (
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
         icon="mdi:wifi",
         value_fn=lambda d: d.wifi_rssi,
+        # RSSI jitters by a dBm or two between polls
+        deadband=3,
+        min_write_interval=timedelta(minutes=5),
     ),
     DotSensorEntityDescription(
         key="firmware_version",
@@ -89,11 +99,14 @@ async def async_setup_entry(
     entities: list[SensorEntity] = []
 
     for device_id in coordinator.data:
+        device_coordinator = coordinator.for_device(device_id)
         for description in SENSOR_DESCRIPTIONS:
             entities.append(
-                DotSensorEntity(coordinator, device_id, description)
+                DotSensorEntity(device_coordinator, device_id, description)
             )
-        entities.append(DotTaskListSensor(coordinator, device_id))
+        entities.append(DotTaskListSensor(device_coordinator, device_id))
+        entities.append(DotStagedImageSensor(device_coordinator, device_id))
+        entities.append(DotPushLatencySensor(device_coordinator, device_id))
 
     async_add_entities(entities)
 
@@ -114,6 +127,10 @@ class DotSensorEntity(CoordinatorEntity[DotDataCoordinator], SensorEntity):
         self.entity_description = description
         self._device_id = device_id
         self._attr_unique_id = f"{device_id}_{description.key}"
+        self._throttle = WriteThrottle(
+            description.deadband, description.min_write_interval
+        )
+        self._written_available: bool | None = None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -141,6 +158,15 @@ class DotSensorEntity(CoordinatorEntity[DotDataCoordinator], SensorEntity):
             return None
         return self.entity_description.value_fn(data)
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        available = self.available
+        if self._throttle.should_write(
+            self.native_value, force=available != self._written_available
+        ):
+            self._written_available = available
+            super()._handle_coordinator_update()
+
 
 class DotTaskListSensor(CoordinatorEntity[DotDataCoordinator], SensorEntity):
     """Sensor showing the number of content tasks on a Dot. device."""
@@ -148,6 +174,8 @@ class DotTaskListSensor(CoordinatorEntity[DotDataCoordinator], SensorEntity):
     _attr_has_entity_name = True
     _attr_name = "Content Tasks"
     _attr_icon = "mdi:playlist-check"
+    # The task list rarely changes and can be long; keep it out of history
+    _unrecorded_attributes = frozenset({"tasks"})
 
     def __init__(
         self,
@@ -185,3 +213,98 @@ class DotTaskListSensor(CoordinatorEntity[DotDataCoordinator], SensorEntity):
         if data is None:
             return {}
         return {"tasks": data.tasks}
+
+
+class DotStagedImageSensor(CoordinatorEntity[DotDataCoordinator], SensorEntity):
+    """Sensor showing a short hash of the image staged for a Dot. device.
+
+    The image bytes themselves never enter the state machine.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Staged Image"
+    _attr_icon = "mdi:image-check-outline"
+
+    def __init__(
+        self,
+        coordinator: DotDataCoordinator,
+        device_id: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._attr_unique_id = f"{device_id}_staged_image"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        data = self.coordinator.data.get(self._device_id)
+        model_name = "Quote/0"
+        if data:
+            model_name = f"Quote/0 (Edition {data.edition})"
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device_id)},
+            name=data.display_name if data else f"Quote/0 {self._device_id[-4:]}",
+            manufacturer=MANUFACTURER,
+            model=model_name,
+            sw_version=data.firmware_version if data else None,
+        )
+
+    @property
+    def native_value(self) -> str | None:
+        staged = self.coordinator.staged_images.get(self._device_id)
+        return staged.digest if staged else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        staged = self.coordinator.staged_images.get(self._device_id)
+        if staged is None:
+            return {}
+        return {"size_bytes": len(staged.data)}
+
+
+class DotPushLatencySensor(CoordinatorEntity[DotDataCoordinator], SensorEntity):
+    """Sensor showing how long the last push took to appear on the panel."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Push to Render Latency"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    def __init__(
+        self,
+        coordinator: DotDataCoordinator,
+        device_id: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._device_id = device_id
+        self._attr_unique_id = f"{device_id}_push_latency"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        data = self.coordinator.data.get(self._device_id)
+        model_name = "Quote/0"
+        if data:
+            model_name = f"Quote/0 (Edition {data.edition})"
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device_id)},
+            name=data.display_name if data else f"Quote/0 {self._device_id[-4:]}",
+            manufacturer=MANUFACTURER,
+            model=model_name,
+            sw_version=data.firmware_version if data else None,
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        record = self.coordinator.history.last_rendered(self._device_id)
+        return record.render_latency if record else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        record = self.coordinator.history.last(self._device_id)
+        if record is None:
+            return {}
+        return {
+            "last_push_outcome": record.outcome,
+            "last_push_api_latency": record.latency,
+        }
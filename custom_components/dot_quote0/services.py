@@ -0,0 +1,639 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api import DotApiError
+from .const import (
+    DATA_RESOLVER,
+    DATA_SCENES,
+    DATA_SYSTEM_STATUS,
+    DITHER_KERNELS,
+    DITHER_TYPES,
+    DOMAIN,
+)
+from .coordinator import DotDataCoordinator
+from .history import OUTCOME_SKIPPED, PushRecord
+from .layout import TITLE_WIDTH, fit_line, fit_message
+from .profiling import async_profile, device_footprint
+from .resolver import ImageResolver, decode_base64
+from .scenes import DotScenes
+from .system_status import METRICS, SystemStatusCollector
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SEND_TEXT = "send_text"
+SERVICE_SEND_IMAGE = "send_image"
+SERVICE_SEND_SYSTEM_STATUS = "send_system_status"
+SERVICE_SEND_CALENDAR = "send_calendar"
+SERVICE_SEND_WEATHER = "send_weather"
+SERVICE_STAGE_IMAGE = "stage_image"
+SERVICE_SET_PLAYLIST = "set_playlist"
+SERVICE_STOP_PLAYLIST = "stop_playlist"
+SERVICE_GET_STATUS = "get_status"
+SERVICE_PROFILE_MEMORY = "profile_memory"
+SERVICE_SNAPSHOT_SCENE = "snapshot_scene"
+SERVICE_RESTORE_SCENE = "restore_scene"
+SERVICE_DELETE_SCENE = "delete_scene"
+
+SEND_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Optional("title"): cv.string,
+        vol.Optional("message"): cv.string,
+        vol.Optional("signature"): cv.string,
+        vol.Optional("icon"): cv.string,
+        vol.Optional("link"): cv.string,
+        vol.Optional("refresh_now", default=True): cv.boolean,
+        vol.Optional("task_key"): cv.string,
+    }
+)
+
+SEND_IMAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Required("image"): cv.string,
+        vol.Optional("link"): cv.string,
+        vol.Optional("border", default=0): vol.In([0, 1]),
+        vol.Optional("dither_type"): vol.In(DITHER_TYPES),
+        vol.Optional("dither_kernel"): vol.In(DITHER_KERNELS),
+        vol.Optional("local_dither", default=False): cv.boolean,
+        vol.Optional("refresh_now", default=True): cv.boolean,
+        vol.Optional("task_key"): cv.string,
+        vol.Optional("min_changed_pixels", default=0): cv.positive_int,
+        vol.Optional("below_threshold", default="skip"): vol.In(["skip", "defer"]),
+    }
+)
+
+STAGE_IMAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Required("image"): cv.string,
+    }
+)
+
+PLAYLIST_ITEM_SCHEMA = vol.Schema(
+    {
+        vol.Optional("title"): cv.string,
+        vol.Optional("message"): cv.string,
+        vol.Optional("signature"): cv.string,
+        vol.Optional("icon"): cv.string,
+        vol.Optional("link"): cv.string,
+    }
+)
+
+SET_PLAYLIST_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Required("items"): vol.All(
+            cv.ensure_list, [PLAYLIST_ITEM_SCHEMA], vol.Length(min=1)
+        ),
+        vol.Optional("task_keys"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("rotate_interval"): cv.positive_time_period,
+    }
+)
+
+STOP_PLAYLIST_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+    }
+)
+
+GET_STATUS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("serial"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("online"): cv.boolean,
+        vol.Optional("max_age"): cv.positive_time_period,
+    }
+)
+
+PROFILE_MEMORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=timedelta(seconds=10)): vol.All(
+            cv.positive_time_period, vol.Range(max=timedelta(minutes=10))
+        ),
+        vol.Optional("top", default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+SCENE_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): cv.string,
+        vol.Optional("serial"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+DELETE_SCENE_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): cv.string,
+    }
+)
+
+SEND_SYSTEM_STATUS_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Optional("metrics"): vol.All(cv.ensure_list, [vol.In(METRICS)]),
+        vol.Optional("refresh_now", default=True): cv.boolean,
+        vol.Optional("task_key"): cv.string,
+    }
+)
+
+SEND_CALENDAR_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Required("calendar_entity"): cv.entity_ids,
+        vol.Optional("hours_ahead", default=24): cv.positive_int,
+        vol.Optional("max_events", default=5): cv.positive_int,
+        vol.Optional("refresh_now", default=True): cv.boolean,
+        vol.Optional("task_key"): cv.string,
+    }
+)
+
+SEND_WEATHER_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial"): cv.string,
+        vol.Required("weather_entity"): cv.entity_id,
+        vol.Optional("include_forecast", default=True): cv.boolean,
+        vol.Optional("forecast_days", default=3): cv.positive_int,
+        vol.Optional("refresh_now", default=True): cv.boolean,
+        vol.Optional("task_key"): cv.string,
+    }
+)
+
+
+def _find_coordinator_for_device(
+    hass: HomeAssistant, device_id: str
+) -> DotDataCoordinator | None:
+    """Find the coordinator that owns the given device_id."""
+    for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        if isinstance(coordinator, DotDataCoordinator):
+            if device_id in (coordinator.data or {}):
+                return coordinator
+    return None
+
+
+def _device_coordinators(
+    hass: HomeAssistant, serials: list[str] | None
+) -> dict[str, DotDataCoordinator]:
+    """Map the given devices, or all devices, to the coordinator owning each."""
+    if serials:
+        devices = {}
+        for device_id in serials:
+            if (coordinator := _find_coordinator_for_device(hass, device_id)) is None:
+                raise DotApiError(
+                    f"Device '{device_id}' not found. Check the serial number."
+                )
+            devices[device_id] = coordinator
+        return devices
+    return {
+        device_id: coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, DotDataCoordinator)
+        for device_id in coordinator.data or {}
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services.
+
+    Handlers only import the calendar renderer and image pipeline when they
+    are first called, keeping integration setup cheap.
+    """
+
+    async def handle_send_text(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+        try:
+            await coordinator.delivery.async_send(
+                device_id,
+                "text",
+                call.data.get("refresh_now", True),
+                title=call.data.get("title"),
+                message=call.data.get("message"),
+                signature=call.data.get("signature"),
+                icon=call.data.get("icon"),
+                link=call.data.get("link"),
+                taskKey=call.data.get("task_key"),
+            )
+        except DotApiError as err:
+            if "not found" in str(err).lower():
+                raise DotApiError(
+                    f"Device '{device_id}' has no Text API content program configured. "
+                    "Add one in the Dot. app first."
+                ) from err
+            raise
+
+    async def handle_send_image(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+        from .imaging import b64_to_bitmap, changed_pixels, to_bitmap
+
+        resolver: ImageResolver = hass.data[DOMAIN][DATA_RESOLVER]
+        # Raw bytes are base64-encoded straight into the request body
+        image_data = await resolver.async_resolve(call.data["image"])
+        refresh_now = call.data.get("refresh_now", True)
+        task_key = call.data.get("task_key")
+        dither_type = call.data.get("dither_type")
+        dither_kernel = call.data.get("dither_kernel")
+
+        if call.data.get("local_dither"):
+            from .dither import dither_image
+
+            if isinstance(image_data, str):
+                image_data = decode_base64(image_data)
+            try:
+                image_data = await resolver.async_add_executor_job(
+                    dither_image, image_data, dither_type or "DIFFUSION", dither_kernel
+                )
+            except (OSError, ValueError) as err:
+                raise DotApiError(f"Could not read the image to dither it: {err}") from err
+            # The frame is already 1-bit; the cloud must not dither it again
+            dither_type, dither_kernel = "NONE", None
+
+        frame = None
+        threshold = call.data.get("min_changed_pixels", 0)
+        if threshold:
+            try:
+                if isinstance(image_data, bytes):
+                    frame = await resolver.async_add_executor_job(to_bitmap, image_data)
+                else:
+                    frame = await resolver.async_add_executor_job(
+                        b64_to_bitmap, image_data
+                    )
+            except (OSError, ValueError) as err:
+                # PIL's UnidentifiedImageError is an OSError
+                raise DotApiError(
+                    f"Could not read the image to count changed pixels: {err}"
+                ) from err
+            previous = coordinator.frames.get((device_id, task_key))
+            changed = changed_pixels(previous, frame)
+            if changed < threshold:
+                if call.data.get("below_threshold") == "skip":
+                    _LOGGER.debug(
+                        "Skipping image for %s: %d of %d pixels changed",
+                        device_id, changed, frame.pixels,
+                    )
+                    coordinator.history.add(
+                        device_id,
+                        PushRecord("image", task_key, dt_util.now(), OUTCOME_SKIPPED),
+                    )
+                    return
+                # Upload the frame but let the panel pick it up on its next
+                # scheduled refresh instead of forcing one now.
+                refresh_now = False
+
+        try:
+            await coordinator.delivery.async_send(
+                device_id,
+                "image",
+                refresh_now,
+                image=image_data,
+                link=call.data.get("link"),
+                border=call.data.get("border", 0),
+                ditherType=dither_type,
+                ditherKernel=dither_kernel,
+                taskKey=task_key,
+            )
+        except DotApiError as err:
+            if "not found" in str(err).lower():
+                raise DotApiError(
+                    f"Device '{device_id}' has no Image API content program configured. "
+                    "Add one in the Dot. app first."
+                ) from err
+            raise
+        if frame is not None:
+            coordinator.frames[(device_id, task_key)] = frame
+
+    async def handle_stage_image(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+        from .imaging import StagedImage
+
+        resolver: ImageResolver = hass.data[DOMAIN][DATA_RESOLVER]
+        image_bytes = await resolver.async_resolve_bytes(call.data["image"])
+        coordinator.staged_images[device_id] = StagedImage.from_bytes(image_bytes)
+        coordinator.for_device(device_id).async_update_listeners()
+
+    async def handle_set_playlist(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+        await coordinator.playlists.async_set(
+            device_id,
+            call.data["items"],
+            task_keys=call.data.get("task_keys"),
+            rotate_interval=call.data.get("rotate_interval"),
+        )
+
+    async def handle_stop_playlist(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+        coordinator.playlists.async_stop(device_id)
+
+    async def handle_get_status(call: ServiceCall) -> ServiceResponse:
+        coordinators = [
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if isinstance(coordinator, DotDataCoordinator)
+        ]
+        serials: list[str] | None = call.data.get("serial")
+        if serials:
+            for device_id in serials:
+                if _find_coordinator_for_device(hass, device_id) is None:
+                    raise DotApiError(
+                        f"Device '{device_id}' not found. Check the serial number."
+                    )
+
+        if (max_age := call.data.get("max_age")) is not None:
+            # Only devices whose cached data is too old go back to the cloud
+            max_seconds = max_age.total_seconds()
+            refreshes = []
+            for coordinator in coordinators:
+                stale = [
+                    device_id
+                    for device_id, device_data in (coordinator.data or {}).items()
+                    if (not serials or device_id in serials)
+                    and (device_data.stale or device_data.age > max_seconds)
+                ]
+                if stale:
+                    refreshes.append(coordinator.async_refresh_devices(stale))
+            if refreshes:
+                await asyncio.gather(*refreshes)
+
+        online = call.data.get("online")
+        devices: dict[str, Any] = {}
+        for coordinator in coordinators:
+            for device_id, device_data in (coordinator.data or {}).items():
+                if serials and device_id not in serials:
+                    continue
+                if online is not None and device_data.online != online:
+                    continue
+                devices[device_id] = device_data.as_dict()
+        return {"devices": devices}
+
+    async def handle_profile_memory(call: ServiceCall) -> ServiceResponse:
+        duration: timedelta = call.data["duration"]
+        allocations = await async_profile(hass, duration.total_seconds(), call.data["top"])
+        devices = {
+            device_id: device_footprint(hass, coordinator, device_id)
+            for device_id, coordinator in _device_coordinators(hass, None).items()
+        }
+        return {
+            "traced_seconds": duration.total_seconds(),
+            **allocations,
+            "devices": devices,
+        }
+
+    async def handle_snapshot_scene(call: ServiceCall) -> ServiceResponse:
+        scenes: DotScenes = hass.data[DOMAIN][DATA_SCENES]
+        captured = await scenes.async_snapshot(
+            call.data["name"], _device_coordinators(hass, call.data.get("serial"))
+        )
+        return {"devices": captured}
+
+    async def handle_restore_scene(call: ServiceCall) -> ServiceResponse:
+        scenes: DotScenes = hass.data[DOMAIN][DATA_SCENES]
+        restored = await scenes.async_restore(
+            call.data["name"], _device_coordinators(hass, call.data.get("serial"))
+        )
+        return {"devices": restored}
+
+    async def handle_delete_scene(call: ServiceCall) -> None:
+        scenes: DotScenes = hass.data[DOMAIN][DATA_SCENES]
+        await scenes.async_delete(call.data["name"])
+
+    async def handle_send_system_status(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+
+        domain_data = hass.data[DOMAIN]
+        if (collector := domain_data.get(DATA_SYSTEM_STATUS)) is None:
+            collector = domain_data[DATA_SYSTEM_STATUS] = SystemStatusCollector(hass)
+            collector.async_start()
+        message = collector.render(call.data.get("metrics"))
+        now = dt_util.now().strftime("%Y-%m-%d %H:%M")
+
+        await coordinator.delivery.async_send(
+            device_id,
+            "text",
+            call.data.get("refresh_now", True),
+            title="System Status",
+            message=message,
+            signature=now,
+            taskKey=call.data.get("task_key"),
+        )
+
+    async def handle_send_calendar(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+
+        from .agenda import format_event, merge_events
+
+        calendar_entities: list[str] = call.data["calendar_entity"]
+        hours_ahead = call.data.get("hours_ahead", 24)
+        max_events = call.data.get("max_events", 5)
+
+        start = dt_util.now()
+        end = start + timedelta(hours=hours_ahead)
+
+        result = await hass.services.async_call(
+            "calendar",
+            "get_events",
+            {
+                "entity_id": calendar_entities,
+                "start_date_time": start.isoformat(),
+                "end_date_time": end.isoformat(),
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+        result = result or {}
+        events = merge_events(
+            (
+                result[entity_id].get("events", [])
+                for entity_id in calendar_entities
+                if entity_id in result
+            ),
+            max_events,
+        )
+
+        if not events:
+            message = "No upcoming events"
+        else:
+            # Pack as many events as the panel shows; the rest become "+N more"
+            message = fit_message((), tuple(format_event(event) for event in events))
+
+        if len(calendar_entities) == 1:
+            cal_state = hass.states.get(calendar_entities[0])
+            cal_name = cal_state.attributes.get("friendly_name", "Calendar") if cal_state else "Calendar"
+        else:
+            cal_name = "Agenda"
+        signature = f"Next {hours_ahead}h"
+
+        await coordinator.delivery.async_send(
+            device_id,
+            "text",
+            call.data.get("refresh_now", True),
+            title=fit_line(cal_name, TITLE_WIDTH),
+            message=message,
+            signature=signature,
+            taskKey=call.data.get("task_key"),
+        )
+
+    async def handle_send_weather(call: ServiceCall) -> None:
+        device_id = call.data["serial"]
+        coordinator = _find_coordinator_for_device(hass, device_id)
+        if coordinator is None:
+            raise DotApiError(f"Device '{device_id}' not found. Check the serial number.")
+
+        weather_entity = call.data["weather_entity"]
+        include_forecast = call.data.get("include_forecast", True)
+        forecast_days = call.data.get("forecast_days", 3)
+
+        state = hass.states.get(weather_entity)
+        if state is None or state.state in ("unknown", "unavailable"):
+            raise DotApiError(f"Weather entity '{weather_entity}' is not available.")
+
+        attrs = state.attributes
+        condition = state.state.replace("_", " ").title()
+        temp = attrs.get("temperature")
+        temp_unit = attrs.get("temperature_unit", "")
+        humidity = attrs.get("humidity")
+        wind_speed = attrs.get("wind_speed")
+        wind_unit = attrs.get("wind_speed_unit", "")
+
+        head = [f"{condition} {temp}{temp_unit}" if temp is not None else condition]
+        details = []
+        if humidity is not None:
+            details.append(f"Humidity: {humidity}%")
+        if wind_speed is not None:
+            details.append(f"Wind: {wind_speed} {wind_unit}")
+        if details:
+            head.append("  ".join(details))
+
+        forecast_lines: list[str] = []
+        if include_forecast and forecast_days > 0:
+            try:
+                forecast_result = await hass.services.async_call(
+                    "weather",
+                    "get_forecasts",
+                    {"entity_id": weather_entity, "type": "daily"},
+                    blocking=True,
+                    return_response=True,
+                )
+                forecasts = []
+                if forecast_result and weather_entity in forecast_result:
+                    forecasts = forecast_result[weather_entity].get("forecast", [])
+                if forecasts:
+                    for fc in forecasts[:forecast_days]:
+                        fc_date = fc.get("datetime", "")
+                        try:
+                            dt = dt_util.parse_datetime(fc_date)
+                            date_str = dt.strftime("%a") if dt else fc_date[:10]
+                        except (ValueError, AttributeError):
+                            date_str = fc_date[:10]
+                        fc_cond = fc.get("condition", "").replace("_", " ").title()
+                        fc_high = fc.get("temperature")
+                        fc_low = fc.get("templow")
+                        if fc_high is not None and fc_low is not None:
+                            forecast_lines.append(f"{date_str}: {fc_cond} {fc_low}-{fc_high}{temp_unit}")
+                        elif fc_high is not None:
+                            forecast_lines.append(f"{date_str}: {fc_cond} {fc_high}{temp_unit}")
+                        else:
+                            forecast_lines.append(f"{date_str}: {fc_cond}")
+            except Exception:
+                _LOGGER.debug("Could not fetch forecast for %s", weather_entity)
+
+        friendly_name = attrs.get("friendly_name", "Weather")
+        now = dt_util.now().strftime("%Y-%m-%d %H:%M")
+
+        await coordinator.delivery.async_send(
+            device_id,
+            "text",
+            call.data.get("refresh_now", True),
+            title=fit_line(friendly_name, TITLE_WIDTH),
+            # Forecast days that do not fit under the current conditions are dropped
+            message=fit_message(tuple(head), tuple(forecast_lines), more=False),
+            signature=now,
+            taskKey=call.data.get("task_key"),
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_TEXT, handle_send_text, schema=SEND_TEXT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_IMAGE, handle_send_image, schema=SEND_IMAGE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STAGE_IMAGE, handle_stage_image, schema=STAGE_IMAGE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PLAYLIST, handle_set_playlist, schema=SET_PLAYLIST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_PLAYLIST, handle_stop_playlist,
+        schema=STOP_PLAYLIST_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_STATUS, handle_get_status,
+        schema=GET_STATUS_SCHEMA, supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE_MEMORY, handle_profile_memory,
+        schema=PROFILE_MEMORY_SCHEMA, supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SNAPSHOT_SCENE, handle_snapshot_scene,
+        schema=SCENE_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE_SCENE, handle_restore_scene,
+        schema=SCENE_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DELETE_SCENE, handle_delete_scene,
+        schema=DELETE_SCENE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_SYSTEM_STATUS, handle_send_system_status,
+        schema=SEND_SYSTEM_STATUS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_CALENDAR, handle_send_calendar,
+        schema=SEND_CALENDAR_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_WEATHER, handle_send_weather,
+        schema=SEND_WEATHER_SCHEMA,
+    )
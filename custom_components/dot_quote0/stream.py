@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import DotApiError, DotConnectionError
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import DotDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds the cloud may hold a long-poll before answering with no change
+WATCH_TIMEOUT = 120
+
+# Backoff between long-polls after connection errors
+RETRY_DELAY = 5
+MAX_RETRY_DELAY = 300
+
+
+class DotStatusStream:
+    """Receive device status changes from the cloud as they happen.
+
+    On start, one long-poll for the first device probes whether the cloud
+    offers the watch endpoint. If it does, every device gets a long-poll
+    loop feeding changes straight into the coordinator, and regular polling
+    drops to a slow safety net. If it does not, or a loop later finds the
+    endpoint gone, the coordinator keeps (or returns to) adaptive polling.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: DotDataCoordinator) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self._tasks)
+
+    @callback
+    def async_start(self) -> None:
+        self._tasks["probe"] = self._hass.async_create_background_task(
+            self._async_probe(), f"{DOMAIN} status stream probe"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        current = asyncio.current_task()
+        for task in self._tasks.values():
+            if task is not current:
+                task.cancel()
+        self._tasks.clear()
+
+    async def _async_probe(self) -> None:
+        coordinator = self._coordinator
+        device_ids = list(coordinator.data or {})
+        if not device_ids:
+            return
+        try:
+            status = await coordinator.api_for(device_ids[0]).watch_device_status(
+                device_ids[0], WATCH_TIMEOUT
+            )
+        except DotApiError as err:
+            _LOGGER.debug("No status stream offered (%s), using adaptive polling", err)
+            self._tasks.clear()
+            return
+
+        _LOGGER.debug("Status stream available, watching %d devices", len(device_ids))
+        del self._tasks["probe"]
+        coordinator.async_set_device_status(device_ids[0], status)
+        for device_id in device_ids:
+            coordinator.for_device(device_id).async_set_streaming(True)
+            self._tasks[device_id] = self._hass.async_create_background_task(
+                self._async_watch(device_id, status if device_id == device_ids[0] else None),
+                f"{DOMAIN} status stream {device_id}",
+            )
+
+    async def _async_watch(self, device_id: str, last: Any) -> None:
+        delay = RETRY_DELAY
+        while True:
+            try:
+                status = await self._coordinator.api_for(device_id).watch_device_status(
+                    device_id, WATCH_TIMEOUT
+                )
+            except DotConnectionError as err:
+                _LOGGER.debug(
+                    "Status stream for %s interrupted (%s), retrying in %ss",
+                    device_id, err, delay,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+            except DotApiError as err:
+                _LOGGER.warning(
+                    "Status stream for %s ended (%s), falling back to polling",
+                    device_id, err,
+                )
+                self._async_fall_back()
+                return
+            delay = RETRY_DELAY
+            if status is not last:
+                self._coordinator.async_set_device_status(device_id, status)
+                last = status
+
+    @callback
+    def _async_fall_back(self) -> None:
+        """Stop every watch and hand all devices back to polling."""
+        device_ids = [device_id for device_id in self._tasks if device_id != "probe"]
+        self.async_stop()
+        for device_id in device_ids:
+            self._coordinator.for_device(device_id).async_set_streaming(False)
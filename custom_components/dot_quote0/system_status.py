@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+METRIC_VERSION = "version"
+METRIC_UPTIME = "uptime"
+METRIC_CPU = "cpu"
+METRIC_MEMORY = "memory"
+METRIC_DISK = "disk"
+METRIC_ENTITIES = "entities"
+
+# Metrics read from a sensor: label, candidate entity ids, value format
+ENTITY_METRICS: dict[str, tuple[str, tuple[str, ...], str]] = {
+    METRIC_UPTIME: ("Uptime", ("sensor.uptime", "sensor.home_assistant_uptime"), "{}"),
+    METRIC_CPU: ("CPU", ("sensor.processor_use", "sensor.processor_use_percent"), "{}%"),
+    METRIC_MEMORY: ("Memory", ("sensor.memory_use_percent",), "{}%"),
+    METRIC_DISK: ("Disk", ("sensor.disk_use_percent", "sensor.disk_use_percent_home"), "{}%"),
+}
+
+METRICS = [
+    METRIC_VERSION,
+    METRIC_UPTIME,
+    METRIC_CPU,
+    METRIC_MEMORY,
+    METRIC_DISK,
+    METRIC_ENTITIES,
+]
+
+
+class SystemStatusCollector:
+    """Render Home Assistant system status without scanning the state machine.
+
+    The existing source sensors of each metric are resolved once and only
+    re-resolved when one of its candidates is added or removed; only those
+    candidates are tracked. The entity count is read from the state
+    machine's index instead of copying every state on each push.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        # metric -> its candidate entity ids that exist, in preference order
+        self._sources: dict[str, tuple[str, ...]] = {}
+        self._candidates: dict[str, str] = {
+            entity_id: metric
+            for metric, (_label, candidates, _fmt) in ENTITY_METRICS.items()
+            for entity_id in candidates
+        }
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        self._unsub = async_track_state_change_event(
+            self._hass, list(self._candidates), self._async_candidate_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_candidate_changed(self, event: Event) -> None:
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (old_state is None) != (new_state is None):
+            self._sources.pop(self._candidates[event.data["entity_id"]], None)
+
+    def _sources_of(self, metric: str) -> tuple[str, ...]:
+        if metric not in self._sources:
+            _label, candidates, _fmt = ENTITY_METRICS[metric]
+            self._sources[metric] = tuple(
+                entity_id
+                for entity_id in candidates
+                if self._hass.states.get(entity_id) is not None
+            )
+        return self._sources[metric]
+
+    def render(self, metrics: list[str] | None = None) -> str:
+        """Return the status message with the chosen metrics, in order."""
+        lines: list[str] = []
+        for metric in metrics or METRICS:
+            if metric == METRIC_VERSION:
+                lines.append(f"HA: {self._hass.config.version}")
+            elif metric == METRIC_ENTITIES:
+                lines.append(f"Entities: {self._hass.states.async_entity_ids_count()}")
+            else:
+                # The first existing candidate with a usable state wins
+                for entity_id in self._sources_of(metric):
+                    state = self._hass.states.get(entity_id)
+                    if state and state.state not in ("unknown", "unavailable"):
+                        label, _candidates, fmt = ENTITY_METRICS[metric]
+                        lines.append(f"{label}: {fmt.format(state.state)}")
+                        break
+        return "\n".join(lines) if lines else "No system data available"
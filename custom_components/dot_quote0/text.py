@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from homeassistant.components.text import TextEntity, TextEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -39,10 +40,10 @@ TEXT_DESCRIPTIONS: tuple[DotTextEntityDescription, ...] = (
         max_length=100,
     ),
     DotTextEntityDescription(
-        key="image_data",
-        name="Image Data",
+        key="image_source",
+        name="Image Source",
         icon="mdi:image-outline",
-        max_length=100000,
+        max_length=255,
     ),
 )
 
@@ -54,16 +55,33 @@ async def async_setup_entry(
 ) -> None:
     coordinator: DotDataCoordinator = hass.data[DOMAIN][entry.entry_id]
     entities: list[DotTextEntity] = []
+    registry = er.async_get(hass)
 
     for device_id in coordinator.data:
+        _migrate_image_source(registry, device_id)
+        device_coordinator = coordinator.for_device(device_id)
         for description in TEXT_DESCRIPTIONS:
             entities.append(
-                DotTextEntity(coordinator, device_id, description)
+                DotTextEntity(device_coordinator, device_id, description)
             )
 
     async_add_entities(entities)
 
 
+def _migrate_image_source(registry: er.EntityRegistry, device_id: str) -> None:
+    """Move the old Image Data text entity to its Image Source unique_id."""
+    old_entity_id = registry.async_get_entity_id(
+        "text", DOMAIN, f"{device_id}_image_data"
+    )
+    if old_entity_id is None:
+        return
+    new_unique_id = f"{device_id}_image_source"
+    if registry.async_get_entity_id("text", DOMAIN, new_unique_id) is not None:
+        registry.async_remove(old_entity_id)
+    else:
+        registry.async_update_entity(old_entity_id, new_unique_id=new_unique_id)
+
+
 class DotTextEntity(CoordinatorEntity[DotDataCoordinator], TextEntity):
     """Text input entity for Dot. Quote/0 device controls."""
 
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from time import monotonic
+from typing import Any
+
+_UNSET = object()
+
+
+class WriteThrottle:
+    """Decide whether a coordinator update is worth an entity state write.
+
+    A value is written when it moved by at least deadband (numbers) or
+    changed at all (anything else), but not more often than min_interval.
+    An unchanged value is rewritten once max_interval has passed, for
+    entities whose attributes should not go stale forever.
+    """
+
+    def __init__(
+        self,
+        deadband: float | None = None,
+        min_interval: timedelta | None = None,
+        max_interval: timedelta | None = None,
+    ) -> None:
+        self._deadband = deadband
+        self._min_interval = min_interval.total_seconds() if min_interval else 0.0
+        self._max_interval = max_interval.total_seconds() if max_interval else None
+        self._value: Any = _UNSET
+        self._written_at = 0.0
+
+    def _changed(self, value: Any) -> bool:
+        previous = self._value
+        if (
+            self._deadband is not None
+            and isinstance(value, (int, float))
+            and isinstance(previous, (int, float))
+        ):
+            return abs(value - previous) >= self._deadband
+        return value != previous
+
+    def should_write(self, value: Any, force: bool = False) -> bool:
+        """Return True, and remember value as written, if it should be written."""
+        now = monotonic()
+        elapsed = now - self._written_at
+        if not (
+            force
+            or self._value is _UNSET
+            or (self._changed(value) and elapsed >= self._min_interval)
+            or (self._max_interval is not None and elapsed >= self._max_interval)
+        ):
+            return False
+        self._value = value
+        self._written_at = now
+        return True
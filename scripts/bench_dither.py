@@ -0,0 +1,84 @@
+"""Micro-benchmark of the local dithering kernels.
+
+Times every dither type and error diffusion kernel on a panel-sized
+(296x152) and a full-size camera frame (1920x1080 by default):
+
+    python scripts/bench_dither.py [--repeat 5] [--full 1920x1080]
+
+Needs numpy, but not Home Assistant: the integration package is mounted
+without running its __init__.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "dot_quote0"
+
+
+def _load_dither():
+    package = types.ModuleType("dot_quote0")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules["dot_quote0"] = package
+    return importlib.import_module("dot_quote0.dither")
+
+
+def _test_image(width: int, height: int) -> np.ndarray:
+    """Return a grayscale frame mixing gradients and hard edges."""
+    y, x = np.mgrid[0:height, 0:width]
+    gradient = x / max(width - 1, 1) * 255
+    rings = (np.hypot(x - width / 2, y - height / 2) // 12 % 2) * 64
+    return np.clip(gradient * 0.75 + rings, 0, 255)
+
+
+def _best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--full", default="1920x1080", help="full-size WxH")
+    args = parser.parse_args()
+
+    dither = _load_dither()
+    full_width, full_height = (int(value) for value in args.full.split("x"))
+    sizes = [(296, 152), (full_width, full_height)]
+    cases = [("ORDERED", None), ("NONE", None)] + [
+        ("DIFFUSION", kernel) for kernel in dither.KERNELS
+    ]
+
+    header = f"{'type':<10} {'kernel':<20}" + "".join(
+        f"{f'{w}x{h} ms':>16}" for w, h in sizes
+    )
+    print(header)
+    print("-" * len(header))
+    images = [_test_image(w, h) for w, h in sizes]
+    for dither_type, kernel in cases:
+        # Full-size diffusion is slow; one run is enough to compare
+        timings = [
+            _best_ms(
+                lambda image=image: dither.dither(image, dither_type, kernel),
+                args.repeat if image.size <= 296 * 152 else 1,
+            )
+            for image in images
+        ]
+        print(
+            f"{dither_type:<10} {kernel or '-':<20}"
+            + "".join(f"{ms:>16.1f}" for ms in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
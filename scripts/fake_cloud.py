@@ -0,0 +1,184 @@
+"""Local stand-in for the Dot. cloud API.
+
+Serves the endpoints DotApi uses for a configurable number of fake devices,
+including conditional status requests and the long-poll status watch, so the
+integration can be exercised without a real account:
+
+    python scripts/fake_cloud.py [--devices 3] [--latency 0.05] [--port 8099]
+
+Point DotApi at it with base_url="http://127.0.0.1:8099" and api key
+"test-key". Only needs aiohttp.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from aiohttp import web
+
+API_KEY = "test-key"
+PREFIX = "/api/authV2/open"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class FakeDevice:
+    def __init__(self, index: int) -> None:
+        self.id = f"FAKE{index:08X}"
+        self.version = 0
+        self.last_render = _now()
+        self.changed = asyncio.Event()
+        self.pushes = 0
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.id}-{self.version}"'
+
+    def info(self) -> dict[str, Any]:
+        return {"id": self.id, "series": "quote", "model": "quote_0", "edition": 2}
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "alias": f"Fake {self.id[-4:]}",
+            "location": "Load test",
+            "status": {
+                "version": "1.0.0",
+                "current": "Power Active",
+                "description": "Fake device",
+                "battery": "Charging",
+                "wifi": "-55 dBm",
+            },
+            "renderInfo": {
+                "last": self.last_render,
+                "current": {"rotated": False, "border": 0, "image": []},
+                "next": {"battery": None, "power": None},
+            },
+        }
+
+    def render(self) -> None:
+        self.last_render = _now()
+        self.version += 1
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class FakeCloud:
+    """aiohttp application imitating the Dot. cloud for a set of devices."""
+
+    def __init__(self, devices: int = 3, latency: float = 0.0, api_key: str = API_KEY) -> None:
+        self.devices = {dev.id: dev for dev in (FakeDevice(i) for i in range(devices))}
+        self.latency = latency
+        self.api_key = api_key
+        self.requests = 0
+        self.bytes_received = 0
+        self.app = web.Application(middlewares=[self._middleware], client_max_size=64 * 1024 * 1024)
+        self.app.router.add_get(f"{PREFIX}/devices", self._devices)
+        self.app.router.add_get(f"{PREFIX}/device/{{id}}/status", self._status)
+        self.app.router.add_get(f"{PREFIX}/device/{{id}}/status/watch", self._watch)
+        self.app.router.add_get(f"{PREFIX}/device/{{id}}/{{type}}/list", self._tasks)
+        self.app.router.add_post(f"{PREFIX}/device/{{id}}/text", self._push)
+        self.app.router.add_post(f"{PREFIX}/device/{{id}}/image", self._push)
+        self.app.router.add_post(f"{PREFIX}/device/{{id}}/next", self._next)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; return the base URL (a free port if port is 0)."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests += 1
+        if request.headers.get("Authorization") != f"Bearer {self.api_key}":
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        if request.can_read_body:
+            self.bytes_received += len(await request.read())
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    def _device(self, request: web.Request) -> FakeDevice:
+        device = self.devices.get(request.match_info["id"])
+        if device is None:
+            raise web.HTTPNotFound(text=json.dumps({"message": "Device not found"}))
+        return device
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        return web.json_response([dev.info() for dev in self.devices.values()])
+
+    async def _status(self, request: web.Request) -> web.Response:
+        device = self._device(request)
+        if request.headers.get("If-None-Match") == device.etag:
+            return web.Response(status=304, headers={"ETag": device.etag})
+        return web.json_response(device.status(), headers={"ETag": device.etag})
+
+    async def _watch(self, request: web.Request) -> web.Response:
+        device = self._device(request)
+        if request.headers.get("If-None-Match") == device.etag:
+            wait = float(request.query.get("wait", 60))
+            try:
+                await asyncio.wait_for(device.changed.wait(), wait)
+            except asyncio.TimeoutError:
+                return web.Response(status=304, headers={"ETag": device.etag})
+        return web.json_response(device.status(), headers={"ETag": device.etag})
+
+    async def _tasks(self, request: web.Request) -> web.Response:
+        self._device(request)
+        return web.json_response([
+            {"type": "TEXT_API", "taskKey": f"text-{index}"} for index in range(3)
+        ] + [{"type": "IMAGE_API", "taskKey": "image-0"}])
+
+    async def _push(self, request: web.Request) -> web.Response:
+        device = self._device(request)
+        payload = await request.json()
+        device.pushes += 1
+        if payload.get("refreshNow", True):
+            device.render()
+        return web.json_response({"code": 200, "message": "ok"})
+
+    async def _next(self, request: web.Request) -> web.Response:
+        self._device(request).render()
+        return web.json_response({"code": 200, "message": "ok"})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    cloud = FakeCloud(args.devices, args.latency)
+    url = await cloud.start(args.host, args.port)
+    print(f"Fake Dot. cloud on {url} (API key {API_KEY!r}), devices:")
+    for device_id in cloud.devices:
+        print(f"  {device_id}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
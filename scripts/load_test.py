@@ -0,0 +1,277 @@
+"""Load test of the push services against the fake cloud.
+
+Starts scripts/fake_cloud.py in-process and fires service calls at it
+concurrently, reporting throughput, latency, event-loop lag and peak traced
+memory for each scenario:
+
+    python scripts/load_test.py [--scenario all] [--calls 500]
+        [--concurrency 50] [--devices 10] [--latency 0.02] [--api-only]
+
+Scenarios: text (send_text), image_small (a 296x152 send_image), image_large
+(a 1920x1080 send_image) and broadcast (one send_text to every device per
+call).
+
+By default the handlers registered by async_setup_services are called
+through a bare Home Assistant instance, so this needs homeassistant
+installed, as for developing the integration. With --api-only, DotApi is
+driven directly and only aiohttp is needed. Memory is measured with
+tracemalloc, which slows everything down somewhat, and the fake cloud shares
+the event loop, so its own work shows up in the lag figures; compare runs
+with the same options only.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import importlib
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import zlib
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fake_cloud import API_KEY, FakeCloud  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "dot_quote0"
+
+SCENARIOS = ("text", "image_small", "image_large", "broadcast")
+
+# Sampling period of the event-loop lag monitor, in seconds
+LAG_INTERVAL = 0.01
+
+
+def _png(width: int, height: int, seed: int = 0) -> bytes:
+    """Return a grayscale noise PNG; noise keeps it from compressing away."""
+    rng = random.Random(seed)
+    raw = b"".join(
+        b"\x00" + rng.randbytes(width) for _ in range(height)
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+    )
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task."""
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(loop.time() - started - LAG_INTERVAL)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+# A driver maps (service, data) to an awaitable performing the call
+Driver = Callable[[str, dict], Awaitable[None]]
+
+
+def _load_api_module():
+    """Import the integration's api module without Home Assistant."""
+    package = types.ModuleType(DOMAIN)
+    package.__path__ = [str(REPO_ROOT / "custom_components" / DOMAIN)]
+    sys.modules[DOMAIN] = package
+    return importlib.import_module(f"{DOMAIN}.api")
+
+
+async def _api_driver(session: aiohttp.ClientSession, url: str):
+    api_module = _load_api_module()
+    api = api_module.DotApi(session, API_KEY, base_url=url)
+
+    async def call(service: str, data: dict) -> None:
+        if service == "send_text":
+            await api.send_text(
+                data["serial"], refreshNow=True, title=data["title"],
+                message=data["message"],
+            )
+        else:
+            await api.send_image(data["serial"], refreshNow=True, image=data["image"])
+
+    async def close() -> None:
+        pass
+
+    return call, close
+
+
+async def _hass_driver(session: aiohttp.ClientSession, url: str):
+    sys.path.insert(0, str(REPO_ROOT))
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.dot_quote0.api import DotApi
+    from custom_components.dot_quote0.const import DATA_RESOLVER
+    from custom_components.dot_quote0.coordinator import DotDataCoordinator
+    from custom_components.dot_quote0.resolver import ImageResolver
+    from custom_components.dot_quote0.services import async_setup_services
+
+    config_dir = tempfile.mkdtemp(prefix="dot_quote0_load_")
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+
+    api = DotApi(session, API_KEY, base_url=url)
+    coordinator = DotDataCoordinator(hass, api, await api.get_devices())
+    await coordinator.async_refresh()
+    hass.data[DOMAIN] = {DATA_RESOLVER: ImageResolver(hass), "load_test": coordinator}
+    async_setup_services(hass)
+
+    async def call(service: str, data: dict) -> None:
+        await hass.services.async_call(DOMAIN, service, data, blocking=True)
+
+    async def close() -> None:
+        await hass.async_stop(force=True)
+
+    return call, close
+
+
+def _requests(scenario: str, device_ids: list[str], calls: int):
+    """Yield one list of (service, data) per measured call."""
+    if scenario.startswith("image"):
+        size = (296, 152) if scenario == "image_small" else (1920, 1080)
+        image = base64.b64encode(_png(*size)).decode()
+    for index in range(calls):
+        if scenario == "broadcast":
+            yield [
+                ("send_text", {
+                    "serial": device_id, "title": "Broadcast",
+                    "message": f"Message {index}",
+                })
+                for device_id in device_ids
+            ]
+        elif scenario == "text":
+            yield [("send_text", {
+                "serial": device_ids[index % len(device_ids)],
+                "title": "Load test", "message": f"Message {index}",
+            })]
+        else:
+            yield [("send_image", {
+                "serial": device_ids[index % len(device_ids)], "image": image,
+            })]
+
+
+async def _run_scenario(
+    call: Driver, scenario: str, device_ids: list[str], args: argparse.Namespace
+) -> dict[str, float]:
+    requests = list(_requests(scenario, device_ids, args.calls))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(batch: list[tuple[str, dict]]) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await asyncio.gather(*(call(service, data) for service, data in batch))
+            except Exception:  # noqa: BLE001 - counted and reported
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    monitor = LoopLagMonitor()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(batch) for batch in requests))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    peak = tracemalloc.get_traced_memory()[1]
+    return {
+        "calls": len(requests),
+        "errors": errors,
+        "calls_per_s": len(requests) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "lag_p99_ms": _percentile(monitor.samples, 0.99) * 1000,
+        "lag_max_ms": max(monitor.samples, default=0.0) * 1000,
+        "peak_mib": (peak - baseline) / 2**20,
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    cloud = FakeCloud(args.devices, args.latency)
+    url = await cloud.start()
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    tracemalloc.start()
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=args.concurrency)
+    ) as session:
+        driver = _api_driver if args.api_only else _hass_driver
+        call, close = await driver(session, url)
+        try:
+            columns = (
+                "calls", "errors", "calls_per_s", "p50_ms", "p99_ms",
+                "lag_p99_ms", "lag_max_ms", "peak_mib",
+            )
+            print(f"{'scenario':<12}" + "".join(f"{name:>12}" for name in columns))
+            for scenario in scenarios:
+                result = await _run_scenario(call, scenario, list(cloud.devices), args)
+                print(
+                    f"{scenario:<12}"
+                    + "".join(
+                        f"{result[name]:>12.0f}" if name in ("calls", "errors")
+                        else f"{result[name]:>12.2f}"
+                        for name in columns
+                    )
+                )
+        finally:
+            await close()
+            await cloud.stop()
+    tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=("all", *SCENARIOS), default="all")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="fake cloud seconds per response")
+    parser.add_argument("--api-only", action="store_true", help="drive DotApi without Home Assistant")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()